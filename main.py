@@ -6,9 +6,15 @@ from src.utils.logging.handlers.telegram import TelegramLogConfig
 from config.config import load_config
 from src.core.event_bus import MultiEventBus
 from src.exchanges.base.exchange import Exchange
+from src.exchanges.base.structures import warmup_orderbook_kernels
 
 import asyncio
 
+try:
+    import uvloop
+except ImportError:  # optional, see requirements.txt
+    uvloop = None
+
 config = load_config("config/base_config.yaml")
 
 
@@ -17,6 +23,9 @@ async def main():
             file_config=FileLogConfig(filepath='file_log.txt'),
             telegram_config=TelegramLogConfig()
             )
+    logging.info("Event loop: %s", type(asyncio.get_running_loop()).__module__)
+    warmup_orderbook_kernels()
+
     exch: Exchange = None
     
     exch.load_required_refs(logging)
@@ -28,7 +37,7 @@ async def main():
 
     traders = \
         [
-            MarketMaker(s, config["mm"]["symbol_params"][s], exch, logging, queue) for s in symbols
+            MarketMaker(s, config["mm"]["symbol_params"][s], exch, logging, queue.bus_for(s)) for s in symbols
         ]
     tasks = \
         [
@@ -38,4 +47,7 @@ async def main():
 
     await asyncio.gather(*tasks)
 
+if uvloop is not None:
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
 asyncio.run(main())
\ No newline at end of file
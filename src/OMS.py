@@ -1,14 +1,19 @@
 from multiprocessing import current_process
-from typing import Dict, Any, List, Union, Set
+from typing import Dict, Any, List, Union, Set, Tuple
 import asyncio
+import heapq
+import sys
+from time import monotonic_ns as _mono_ns
+import numpy as np
 
 from src.exchanges.base.constants import OrderType
 from src.utils.logging.logger import Logger
 from src.exchanges.base.structures import Order, Side, OrderType
 from src.exchanges.base.exchange import Exchange
-from src.utils.misc_utils import time_ms
 from src.utils.calc_utils import nbabs
-from src.utils.rounding_utils import round_step
+from src.utils.rounding_utils import round_step_fast, round_step_array, step_precision
+
+_TP_LEVEL = sys.intern("_tp")
 
 class OMS:
 
@@ -20,18 +25,48 @@ class OMS:
         self.tick_size = config["tick_size"]
         self.logger = logger
 
+        self._tp_up = 1 + self.tp_distance/10000
+        self._tp_dn = 1 - self.tp_distance/10000
+        self._tp_vectorize_min = 4
+        self._inv_tick = 1.0 / self.tick_size
+        self._tick_precision = step_precision(self.tick_size)
+
+        # Fills are buffered briefly so a burst of fill messages places TPs in one request
+        self._tp_flush_ms = config.get("tp_flush_ms", 5)
+        self._tp_buffer: List[Order] = []
+        self._tp_flush_task: Union[asyncio.Task, None] = None
+
         self._overwrite = {"NEW", "PARTIALLY_FILLED"}
         self._remove = {"FILLED", "CANCELLED"}
         self._rejected = {"REJECTED"}
         self.orders_state: Dict[str, Order] = {}
-
-        self.pending_levels: Dict[str, float] = {}
+        self._orders_by_level: Dict[str, Order] = {}
+        # Non-TP orders in `orders_state`; unlike the level index this still sees
+        # several live orders left at one level
+        self._live_quote_orders = 0
+        # Older orders displaced from their level by a newer one, cancelled on the next update
+        self._duplicate_orders: List[Order] = []
+
+        # Struct-of-arrays mirror of resting order prices, one slot per level,
+        # used for a vectorised out-of-bounds pass once there are enough levels
+        self._soa_min_orders = 8
+        self._oob_sensitivity = 0.1
+        self._prices = np.full(max(2 * self.num_orders, 16), np.nan, dtype=np.float64)
+        self._slot_of_level: Dict[str, int] = {}
+        self._free_slots: List[int] = list(range(len(self._prices) - 1, -1, -1))
+
+        # level -> token of its live heap entry; heap holds (deadline_ms, token, level)
+        self.pending_levels: Dict[str, int] = {}
+        self._pending_heap: List[Tuple[int, int, str]] = []
+        self._pending_token = 0
         self.timeout = 10.0 * 1000
-        self.order_count = 0
 
     def _add_pending_level(self, level: str):
-        """Add a level to pending with current timestamp"""
-        self.pending_levels[level] = time_ms()
+        """Add a level to pending with a deadline `self.timeout` from now"""
+        self._pending_token += 1
+        deadline = _mono_ns() // 1_000_000 + self.timeout
+        heapq.heappush(self._pending_heap, (deadline, self._pending_token, level))
+        self.pending_levels[level] = self._pending_token
     
     def _remove_pending_level(self, level: str):
         """Remove a level from pending"""
@@ -40,62 +75,109 @@ class OMS:
         except KeyError:
             pass
 
-    def _cleanup_stale_pending(self, level: str):
-        """Remove pending levels that have exceeded timeout"""
-        if level not in self.pending_levels:
-            return 
-        curr = time_ms()
-        if curr - self.pending_levels[level] > self.timeout:
-            self.logger.warning(f"OMS {self.symbol} - Cleaning up stale pending level: {level}")
-            del self.pending_levels[level]
+    def _cleanup_stale_pending(self):
+        """Remove all pending levels that have exceeded timeout"""
+        heap = self._pending_heap
+        curr = _mono_ns() // 1_000_000
+        while heap and heap[0][0] < curr:
+            _, token, level = heapq.heappop(heap)
+            # Entries for levels that were re-added or already resolved are skipped
+            if self.pending_levels.get(level) == token:
+                self.logger.warning(f"OMS {self.symbol} - Cleaning up stale pending level: {level}")
+                del self.pending_levels[level]
 
     
     def _is_level_pending(self, level: str) -> bool:
         """Check if level is pending (with automatic cleanup)"""
-        self._cleanup_stale_pending(level)
+        self._cleanup_stale_pending()
         return level in self.pending_levels
 
+    def _index_order(self, order: Order):
+        """Track `order` as the live order at its level"""
+        level = order.level
+        current = self._orders_by_level.get(level)
+        if current is not None and current.oid != order.oid:
+            self.logger.warning(f"OMS {self.symbol} - Duplicate orders at level {level}, cancelling {current.oid}")
+            self._duplicate_orders.append(current)
+        self._orders_by_level[level] = order
+        slot = self._slot_of_level.get(level)
+        if slot is None:
+            if not self._free_slots:
+                self._grow_slots()
+            slot = self._free_slots.pop()
+            self._slot_of_level[level] = slot
+        self._prices[slot] = order.price
+
+    def _unindex_order(self, order: Order):
+        """Drop `order` from its level, unless a newer order already replaced it"""
+        level = order.level
+        if self._orders_by_level.get(level) is not order:
+            return
+        del self._orders_by_level[level]
+        slot = self._slot_of_level.pop(level)
+        self._prices[slot] = np.nan
+        self._free_slots.append(slot)
+
+    def _grow_slots(self):
+        n = len(self._prices)
+        self._prices = np.concatenate([self._prices, np.full(n, np.nan, dtype=np.float64)])
+        self._free_slots.extend(range(2 * n - 1, n - 1, -1))
+
     def update_orders_state(self, data: List[Dict]) -> bool:
 
         filled = []
 
         for order in data:
-            cloid = order["order"]["cloid"]
-            level = cloid[-3:]
 
             if order['status'] in self._overwrite:
                 parsed_order = Order(**order["order"])
+                level = parsed_order.level
                 if parsed_order.oid is not None:
+                    if level != _TP_LEVEL and parsed_order.oid not in self.orders_state:
+                        self._live_quote_orders += 1
                     new = {parsed_order.oid: parsed_order} 
                     self.orders_state.update(new)
-                    if level != "_tp":
-                        self.order_count += 1
+                    if level != _TP_LEVEL:
+                        self._index_order(parsed_order)
                         self._remove_pending_level(level)
                 else:
                     self.logger.error(f"Order {parsed_order} has no oid")
-                    if level and level != '_tp':
+                    if level and level != _TP_LEVEL:
                         self._remove_pending_level(level)
                     continue
 
             elif order['status'] in self._remove:
                 oid = order["order"]["oid"]
-                is_tp = cloid[-3:] == "_tp"
-                if oid in self.orders_state:
+                current_order = self.orders_state.get(oid)
+                if current_order is not None:
+                    level = current_order.level
+                    is_tp = level == _TP_LEVEL
                     if order['status'] == "FILLED" and not is_tp:
                         self.logger.info(f"FILL {self.symbol} - {order['order']['symbol']} - {order['order']['amount']} contracts @ {order['order']['price']}")
-                        filled.append(self.orders_state[oid])
+                        filled.append(current_order)
                     del self.orders_state[oid]
                     if not is_tp:
-                        self.order_count -= 1
+                        self._live_quote_orders -= 1
+                        self._unindex_order(current_order)
                         self._remove_pending_level(level)
             
             elif order['status'] in self._rejected:
                 self.logger.info(f"OMS {self.symbol} - Order rejected! {order}")
-                self._remove_pending_level(level)
+                self._remove_pending_level(order["order"]["cloid"][-3:])
 
         if filled:
-            asyncio.create_task(self._place_take_profits(filled))
-            self.logger.info(   f"OMS {self.symbol} - PLACING TPS FOR: {filled}")
+            self._tp_buffer.extend(filled)
+            if self._tp_flush_task is None:
+                self._tp_flush_task = asyncio.create_task(self._flush_take_profits())
+
+    async def _flush_take_profits(self):
+        try:
+            await asyncio.sleep(self._tp_flush_ms / 1000)
+        finally:
+            filled, self._tp_buffer = self._tp_buffer, []
+            self._tp_flush_task = None
+        self.logger.info(f"OMS {self.symbol} - PLACING TPS FOR: {filled}")
+        await self._place_take_profits(filled)
 
     async def cancel_all(self):
         response = await self.exch.cancel_all_orders(self.symbol)
@@ -103,57 +185,105 @@ class OMS:
             self.logger.warning(f"OMS {self.symbol} - {response.get('error')}")
         else:
             self.pending_levels.clear()
+            self._pending_heap.clear()
 
     async def cancel_orders(self, orders: List[Order]):
         response = await self.exch.bulk_cancel_order(orders)
+        if response is None:
+            return await self._send_each(self.exch.cancel_order, orders, "cancel")
         if isinstance(response, list):
             for i in response:
                 if isinstance(i, dict) and i.get("status") == "ERROR":
                     self.logger.warning(f"OMS {self.symbol} - {i.get('error')}")
 
+    async def batch_cancel_replace(self, cancels: List[Order], places: List[Order], amends: List[Order]):
+        response = await self.exch.batch_cancel_replace(cancels, places, amends)
+
+        if response is None:
+            # Exchange has no batch endpoint, fall back to one request per action
+            tasks = []
+            if cancels:
+                tasks.append(self.cancel_orders(cancels))
+            if places:
+                tasks.append(self.place_orders(places))
+            if amends:
+                tasks.append(self.amend_orders(amends))
+            await asyncio.gather(*tasks)
+            return
+
+        if not isinstance(response, list):
+            self.logger.warning(f"OMS {self.symbol} - Unexpected batch response: {response}")
+            return
+
+        # Results mirror the request layout: cancels, then places, then amends
+        pending = places + amends
+        for i, res in enumerate(response):
+            if isinstance(res, dict) and res.get("status") == "ERROR":
+                self.logger.warning(f"OMS {self.symbol} - {res.get('error')}")
+                j = i - len(cancels)
+                if 0 <= j < len(pending):
+                    self._remove_pending_level(pending[j].level)
+
     async def place_orders(self, orders: List[Order]):
-        tasks = [
-            self.exch.create_order(order) for order in orders
-        ]
-        try:
-            response = await asyncio.gather(*tasks, return_exceptions=True)
-            for i, res in enumerate(response):
-                if isinstance(res, Exception):
-                    self.logger.error(f"OMS {self.symbol} - Order placement failed: {res}")
-                elif isinstance(res, dict) and res.get("status") == "ERROR":
-                    self.logger.warning(f"OMS {self.symbol} - {res.get('error')}")
-                    
-            return response
-        except Exception as e:
-            self.logger.error(f"OMS {self.symbol} - asyncio.gather failed: {e}")
-            return []
+        response = await self.exch.bulk_create_order(orders)
+        if response is None:
+            # Exchange has no bulk endpoint, send one request per order
+            return await self._send_each(self.exch.create_order, orders, "placement")
+        self._check_responses(response, "placement")
+        return response
     
     async def amend_orders(self, orders: List[Order]):
+        response = await self.exch.bulk_amend_order(orders)
+        if response is None:
+            return await self._send_each(self.exch.amend_order, orders, "amend")
+        self._check_responses(response, "amend")
+        return response
+
+    async def _send_each(self, send, orders: List[Order], action: str):
         tasks = [
-            self.exch.amend_order(order) for order in orders
+            send(order) for order in orders
         ]
         try:
             response = await asyncio.gather(*tasks, return_exceptions=True)
-            for res in response:
-                if isinstance(res, Exception):
-                    self.logger.error(f"OMS {self.symbol} - Order amend failed: {res}")
-                elif isinstance(res, dict) and res.get("status") == "ERROR":
-                    self.logger.warning(f"OMS {self.symbol} - {res.get('error')}")
+            self._check_responses(response, action)
             return response
         except Exception as e:
-            self.logger.error(f"OMS {self.symbol} - asyncio.gather failed (amend): {e}")
+            self.logger.error(f"OMS {self.symbol} - asyncio.gather failed ({action}): {e}")
             return []
+
+    def _check_responses(self, response: List | Dict, action: str):
+        if isinstance(response, dict):
+            response = [response]
+        for res in response:
+            if isinstance(res, Exception):
+                self.logger.error(f"OMS {self.symbol} - Order {action} failed: {res}")
+            elif isinstance(res, dict) and res.get("status") == "ERROR":
+                self.logger.warning(f"OMS {self.symbol} - {res.get('error')}")
     
     async def _place_take_profits(self, filled_orders: List[Order]):
         try:
+            n = len(filled_orders)
+            if n >= self._tp_vectorize_min:
+                prices = np.fromiter((o.price for o in filled_orders), dtype=np.float64, count=n)
+                is_buy = np.fromiter((o.side is Side.BUY for o in filled_orders), dtype=bool, count=n)
+                tp_prices = np.where(is_buy, prices * self._tp_up, prices * self._tp_dn)
+                tp_prices = round_step_array(tp_prices, self.tick_size, self._inv_tick, self._tick_precision).tolist()
+            else:
+                tp_prices = [
+                    round_step_fast(
+                        o.price * (self._tp_up if o.side is Side.BUY else self._tp_dn),
+                        self.tick_size, self._inv_tick, self._tick_precision
+                    )
+                    for o in filled_orders
+                ]
+
             tp_orders = []
-            for order in filled_orders:
+            for order, tp_price in zip(filled_orders, tp_prices):
                 tp_order = Order(
                     symbol=self.symbol,
-                    side=Side.SELL if order.side == Side.BUY else Side.BUY,
+                    side=Side.SELL if order.side is Side.BUY else Side.BUY,
                     amount=order.amount,
-                    price=round_step(order.price * (1 + self.tp_distance/10000) if order.side == Side.BUY 
-                        else order.price * (1 - self.tp_distance/10000), self.tick_size),
+                    price=tp_price,
                     order_type=OrderType.LIMIT,
                     cloid=order.cloid + "_tp"
                 )
@@ -214,10 +344,9 @@ class OMS:
 
         Steps
         -----
-        1. Extract the level number from the `cloid` of the `new_order`.
-        2. Iterate through the current orders in `self.data["orders"]`.
-        3. Compare the level number of each current order with the `new_order` level number.
-        4. Return the first matching order found, or an empty Order if no match is found.
+        1. Take the level number cached on the `new_order` (see `Order.level`).
+        2. Look up the level in `self._orders_by_level`, which is kept in sync with
+           `self.orders_state` by `update_orders_state`.
 
         Parameters
         ----------
@@ -227,14 +356,9 @@ class OMS:
         Returns
         -------
         Order
-            The order with the closest price to the target price and matching side.
+            The live order resting at the same level, or None if the level is empty.
         """
-        new_order_level = new_order.cloid[-3:]
-
-        for oid, current_order in self.orders_state.items():
-            if current_order.cloid[-3:] == new_order_level:
-                return current_order
-        return None
+        return self._orders_by_level.get(new_order.level)
 
     async def update(self, new_orders: List[Order], lob: Dict):
         mid = lob["mid"]
@@ -243,45 +367,56 @@ class OMS:
         markets = []
         cancels = []
         amends = []
+
+        if self._duplicate_orders:
+            cancels.extend(self._duplicate_orders)
+            self._duplicate_orders.clear()
+
+        use_soa = self.num_orders >= self._soa_min_orders
+        if use_soa:
+            buffers = np.abs(self._prices - mid) * self._oob_sensitivity
             
         for order in new_orders:
-            match order.order_type:
-                case OrderType.MARKET:
-                    markets.append(order)
-                case OrderType.LIMIT:
-                    level = order.cloid[-3:]
-
-                    if self._is_level_pending(level):
-                        self.logger.warning(f"OMS {self.symbol} - Skipping level {level} - already pending")
-                        continue
-
-                    matched_old_order = self.find_matched_order(order)
-                    if matched_old_order != None:
-                        out_of_bounds = self.is_out_of_bounds(matched_old_order, order, mid)
-                        if out_of_bounds:
-                            self._add_pending_level(level)
-                            order.oid = matched_old_order.cloid
-                            amends.append(order)
+            if order.order_type is OrderType.LIMIT:
+                level = order.level
+
+                if self._is_level_pending(level):
+                    self.logger.warning(f"OMS {self.symbol} - Skipping level {level} - already pending")
+                    continue
+
+                matched_old_order = self.find_matched_order(order)
+                if matched_old_order != None:
+                    if use_soa:
+                        slot = self._slot_of_level[level]
+                        out_of_bounds = abs(order.price - self._prices[slot]) > buffers[slot]
                     else:
+                        out_of_bounds = self.is_out_of_bounds(matched_old_order, order, mid, self._oob_sensitivity)
+                    if out_of_bounds:
                         self._add_pending_level(level)
-                        limits.append(order) 
+                        order.oid = matched_old_order.cloid
+                        amends.append(order)
+                else:
+                    self._add_pending_level(level)
+                    limits.append(order) 
+
+            elif order.order_type is OrderType.MARKET:
+                markets.append(order)
+
         if markets:
             await self.place_orders(markets)
             await self.cancel_all()
         
-        tasks = []
-        if cancels:
-            tasks.append(self.cancel_orders(cancels))
-        if limits:
-            tasks.append(self.place_orders(limits))
-        if amends:
-            tasks.append(self.amend_orders(amends))
-
-        await asyncio.gather(*tasks)
-
-        if self.order_count > self.num_orders:
-            self.logger.warning(F"OMS {self.symbol} - {self.order_count} > {self.num_orders}, Exceeding max orders! Cancelling all...")
+        if cancels or limits or amends:
+            await self.batch_cancel_replace(cancels, limits, amends)
+
+        order_count = self._live_quote_orders
+        if order_count > self.num_orders:
+            self.logger.warning(F"OMS {self.symbol} - {order_count} > {self.num_orders}, Exceeding max orders! Cancelling all...")
             await self.cancel_all()
+
+        # Quote orders come from Order.acquire and nothing keeps them once sent
+        for order in new_orders:
+            order.release()
     
     async def simple_update(self, new_orders: List[Order]): 
         try:
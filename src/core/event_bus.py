@@ -1,12 +1,24 @@
 from typing import Any, List, Dict
+from collections import deque
 import asyncio
+from time import perf_counter_ns
 
-from src.utils.misc_utils import time_ms
 from src.core.events import Event
 
 class EventBus:
+    """
+    Single-producer/single-consumer event queue for one stream key.
+
+    Backed by a deque plus readiness events instead of `asyncio.Queue`, which
+    skips the generic getter/putter future bookkeeping on every put/get. Safe
+    only within a single event loop. When `maxsize` > 0, `put` waits for room.
+    """
+
     def __init__(self, maxsize: int = 0) -> None:
-        self._queue = asyncio.Queue(maxsize=maxsize)
+        self._dq: deque = deque()
+        self._maxsize = maxsize
+        self._not_empty = asyncio.Event()
+        self._not_full = asyncio.Event()
         self._last_id = 0
         self._closed = False
 
@@ -14,19 +26,57 @@ class EventBus:
         self._last_id += 1
         return self._last_id
 
+    def _append(self, event_type: str, data: Any) -> int:
+        seq_id = self._next_id()
+        evt = Event(seq_id=seq_id, event_type=event_type, data=data, ts_ns=perf_counter_ns())
+        self._dq.append(evt)
+        self._not_empty.set()
+        return seq_id
+
     async def put(self, event_type: str, data: Any) -> int:
         if self._closed:
             raise RuntimeError("Queue is closed")
-        seq_id = self._next_id()
-        evt = Event(seq_id=seq_id, event_type=event_type, data=data, ts_ms=time_ms())
-        await self._queue.put(evt)
-        return seq_id
+        while self._maxsize and len(self._dq) >= self._maxsize:
+            self._not_full.clear()
+            await self._not_full.wait()
+        return self._append(event_type, data)
+
+    def put_nowait(self, event_type: str, data: Any) -> bool:
+        """
+        Enqueue without awaiting. Returns False when the bus is full, in which
+        case the caller should fall back to `await put(...)`.
+        """
+        if self._closed:
+            raise RuntimeError("Queue is closed")
+        if self._maxsize and len(self._dq) >= self._maxsize:
+            return False
+        self._append(event_type, data)
+        return True
 
     async def get(self) -> Event:
-        return await self._queue.get()
+        while not self._dq:
+            self._not_empty.clear()
+            await self._not_empty.wait()
+        evt = self._dq.popleft()
+        if self._maxsize:
+            self._not_full.set()
+        return evt
+
+    def drain_nowait(self, max_n: int = 64) -> List[Event]:
+        """
+        Pop up to `max_n` already queued events without waiting.
+        """
+        dq = self._dq
+        n = min(len(dq), max_n)
+        if not n:
+            return []
+        events = [dq.popleft() for _ in range(n)]
+        if self._maxsize:
+            self._not_full.set()
+        return events
 
     def empty(self) -> bool:
-        return self._queue.empty()
+        return not self._dq
 
     def close(self) -> None:
         self._closed = True
@@ -41,25 +91,38 @@ class MultiEventBus:
         for key in stream_keys:
             self._queues[key] = EventBus(maxsize=maxsize)
     
+    def bus_for(self, stream_key: str) -> EventBus:
+        try:
+            return self._queues[stream_key]
+        except KeyError:
+            raise UnknownStreamKeyError(f"Unknown stream key: {stream_key}") from None
+
     async def put(self, stream_key: str, event_type: str, data: Any) -> int:
-        if stream_key not in self._queues:
-            raise UnknownStreamKeyError(f"Unknown stream key: {stream_key}")
-        return await self._queues[stream_key].put(event_type, data)
+        try:
+            bus = self._queues[stream_key]
+        except KeyError:
+            raise UnknownStreamKeyError(f"Unknown stream key: {stream_key}") from None
+        return await bus.put(event_type, data)
     
+    def put_nowait(self, stream_key: str, event_type: str, data: Any) -> bool:
+        try:
+            bus = self._queues[stream_key]
+        except KeyError:
+            raise UnknownStreamKeyError(f"Unknown stream key: {stream_key}") from None
+        return bus.put_nowait(event_type, data)
+
     async def get(self, stream_key: str) -> Event:
-        if stream_key not in self._queues:
-            raise UnknownStreamKeyError(f"Unknown stream key: {stream_key}")
-        return await self._queues[stream_key].get()
+        try:
+            bus = self._queues[stream_key]
+        except KeyError:
+            raise UnknownStreamKeyError(f"Unknown stream key: {stream_key}") from None
+        return await bus.get()
     
     def empty(self, stream_key: str) -> bool:
-        if stream_key not in self._queues:
-            raise UnknownStreamKeyError(f"Unknown stream key: {stream_key}")
-        return self._queues[stream_key].empty()
+        return self.bus_for(stream_key).empty()
 
     def close(self, stream_key: str) -> None:
-        if stream_key not in self._queues:
-            raise UnknownStreamKeyError(f"Unknown stream key: {stream_key}")
-        self._queues[stream_key]._closed = True
+        self.bus_for(stream_key).close()
 
     def keys(self) -> List[str]:
         return list(self._queues.keys())
\ No newline at end of file
@@ -1,9 +1,9 @@
 from dataclasses import dataclass
 from typing import Any
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Event:
     seq_id: int
     event_type: str
-    data: Any
-    ts_ms: int
\ No newline at end of file
+    data: Any  # already decoded by the producing Handler, never raw JSON
+    ts_ns: int  # time.perf_counter_ns at publish, only meaningful as a delta
\ No newline at end of file
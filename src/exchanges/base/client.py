@@ -1,10 +1,11 @@
 import asyncio
 import aiohttp
-import json
+import orjson
 from abc import ABC, abstractmethod
-from typing import Tuple, Dict, Union, Any, Literal
+from typing import Tuple, Dict, Union, Any, Literal, Optional
 
 from src.utils.misc_utils import time_ms
+from src.utils.http_utils import shared_connector, release_connector
 from src.utils.logging.logger import Logger
 
 class Client(ABC):
@@ -47,7 +48,7 @@ class Client(ABC):
         511: "AuthenticationError",
     }
 
-    def __init__(self, api_key: str, api_secret: str) -> None:
+    def __init__(self, api_key: str, api_secret: str, host: Optional[str] = None) -> None:
         """
         Initializes the Client class with API key and secret.
 
@@ -58,12 +59,27 @@ class Client(ABC):
 
         api_secret : str
             The API secret for authentication.
+
+        host : str, optional
+            The exchange REST host. Clients for the same host share one keep-alive
+            connection pool, so repeat requests skip the TCP/TLS handshake.
         """
         self.api_key, self.api_secret = api_key, api_secret
-        self.session = aiohttp.ClientSession()
+        self.host = host
+        self.session = aiohttp.ClientSession(
+            connector=shared_connector(host),
+            connector_owner=False,
+        )
         self.timestamp = time_ms()
 
         self.default_headers = {"Accept": "application/json"}
+        self._ok_codes = frozenset(range(200, 300))
+
+        # Last signed headers per (method, url without query), handed back to `sign_headers`
+        # as a template. Kept in recency order and capped, since urls carrying order ids
+        # would otherwise add an entry per request
+        self.sign_cache_size = 256
+        self._sign_cache: Dict[Tuple[str, str], Dict[str, Any]] = {}
     
     def load_required_refs(self, logging: Logger) -> None:
         """
@@ -90,12 +106,12 @@ class Client(ABC):
         self.timestamp = time_ms()
         return self.timestamp
 
-    async def response_code_checker(self, code: int) -> bool:
+    def response_code_checker(self, code: int) -> bool:
         """
-        Check the status code and raise exceptions for errors.
+        Check the status code and log errors.
 
-        This method checks if the given HTTP status code is a known error code.
-        It raises an exception with the reason for known error codes and for unknown status codes.
+        This method checks if the given HTTP status code is a success code.
+        Otherwise it logs the reason for known error codes, or flags the code as unknown.
 
         Parameters
         ----------
@@ -105,27 +121,17 @@ class Client(ABC):
         Returns
         -------
         bool
-            True if the status code is between 200 and 299 (inclusive).
-
-        Raises
-        ------
-        Exception
-            If the status code is known, the exception message includes the reason.
-            If the status code is unknown, the exception message indicates it is unknown.
+            True if the status code is between 200 and 299 (inclusive), False otherwise.
         """
-        match code:
-            case code if 200 <= code <= 299:
-                return True
+        if code in self._ok_codes:
+            return True
 
-            case code if code in self.http_exceptions:
-                reason = self.http_exceptions[code]
-                self.logging.error(Exception(f"Known status code - {code} - {reason}"))
-
-            case _:
-                self.logging.error(Exception(f"Known status code - {code}"))
+        reason = self.http_exceptions.get(code, "Unknown")
+        self.logging.error(Exception(f"Known status code - {code} - {reason}"))
+        return False
 
     @abstractmethod
-    def sign_headers(self, method: str, header: Dict) -> Dict[str, Any]:
+    def sign_headers(self, method: str, header: Dict, template: Optional[Dict] = None) -> Dict[str, Any]:
         """
         Sign & encrypt the header inline the appropriate exchange's needs.
 
@@ -136,6 +142,13 @@ class Client(ABC):
 
         header : Dict
             The header to be signed.
+
+        template : Dict, optional
+            The headers returned by the previous call for the same method and url.
+            Only the timestamp and signature/body-hash fields vary between calls,
+            so implementations may copy this and rewrite just those fields instead
+            of rebuilding the static part. None on the first call.
+
         Returns
         -------
         Dict[str, Any]
@@ -155,10 +168,15 @@ class Client(ABC):
 
         try:
             if headers and not signed:
-                headers = self.sign_headers(method, headers)
+                cache = self._sign_cache
+                key = (method, url.partition("?")[0])
+                headers = self.sign_headers(method, headers, cache.pop(key, None))
+                cache[key] = headers
+                if len(cache) > self.sign_cache_size:
+                    del cache[next(iter(cache))]
 
             if data:
-                data = json.dumps(data)
+                data = orjson.dumps(data)
 
             response = await self.session.request(
                 url=url,
@@ -168,16 +186,16 @@ class Client(ABC):
                 data=data,
             )
 
-            if await self.response_code_checker(response.status) == False:
-                response_json = await response.json()
+            if not self.response_code_checker(response.status):
+                response_json = await response.json(loads=orjson.loads)
                 self.logging.error(f"CLIENT - Failed request: {response_json}")
 
             else:
-                response_json = await response.json()
+                response_json = await response.json(loads=orjson.loads)
 
             return response_json
 
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             self.logging.error(f"CLIENT - Failed to decode JSON: {e}")
             
         except Exception as e:
@@ -194,4 +212,5 @@ class Client(ABC):
         if self.session:
             await self.logging.info(topic="CLIENT", msg="Shutting down...")
             await self.session.close()
+            await release_connector(self.host)
             del self.session
\ No newline at end of file
@@ -1,16 +1,16 @@
-from enum import Enum
+from enum import IntEnum
 from abc import ABC
 from typing import Dict
 
-class Side(Enum):
+class Side(IntEnum):
     SELL = 0
     BUY = 1
 
-class OrderType(Enum):
+class OrderType(IntEnum):
     MARKET = 0
     LIMIT = 1
 
-class TIF(Enum):
+class TIF(IntEnum):
     GTC = 0
     FOK = 1
     POST = 2
@@ -30,6 +30,10 @@ class StrNumConverter:
         self.str_to_num: Dict[str, float] = str_to_num
         self.num_to_str: Dict[float, str] = {v: k for k, v in self.str_to_num.items()}
 
+        # Pre-bound lookups, called for every order parsed or submitted
+        self._to_str_get = self.num_to_str.get
+        self._to_num_get = self.str_to_num.get
+
     def to_str(self, value: float):
         """
         Converts a numerical value to its str representation.
@@ -45,7 +49,7 @@ class StrNumConverter:
             The str representation of the numerical value.
             If the value is not found, returns "UNKNOWN".
         """
-        return self.num_to_str.get(value, self.DEFAULT_UNKNOWN_STR)
+        return self._to_str_get(value, self.DEFAULT_UNKNOWN_STR)
 
     def to_num(self, name: str):
         """
@@ -62,7 +66,7 @@ class StrNumConverter:
             The numerical representation of the str name.
             If the name is not found, returns -1.0.
         """
-        return self.str_to_num.get(name, self.DEFAULT_UNKNOWN_NUM)
+        return self._to_num_get(name, self.DEFAULT_UNKNOWN_NUM)
 
 class SideConverter(StrNumConverter):
     """
@@ -1,10 +1,13 @@
-from typing import Callable, Dict
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from abc import ABC, abstractmethod
 import websockets
-import json
+import orjson
+import msgspec
 import asyncio
+import re
 
 from src.utils.logging.logger import Logger
+from src.exchanges.base.data.handler import Handler, DuplexHandler
 
 class Data(ABC):
 
@@ -14,7 +17,14 @@ class Data(ABC):
         self.api_secret = api_secret
 
         self.WS_URL = None
-        self.callbacks = {}
+        # Large snapshots fit in one frame; per-message deflate costs more CPU than it saves on
+        # small market data frames
+        self.ws_connect_kwargs = {"max_size": 2**22, "compression": None}
+        # callback_key -> (callback, subscription_key), see `register_callback`
+        self.callbacks: Dict[str, Tuple[Callable, str]] = {}
+        # Bound callbacks by integer id, so drain loops index a list instead of hashing keys
+        self._hot_callbacks: List[Callable] = []
+        self._callback_ids: Dict[str, int] = {}
         self.subscriptions = {}
         self.active_subscriptions = set()
 
@@ -29,6 +39,33 @@ class Data(ABC):
         """
         self.logging = logging
 
+    def register_callback(self, callback_key: str, callback: Callable, subscription_key: str | None = None) -> None:
+        """
+        Register `callback` for `callback_key`, resolving its subscription key once.
+
+        Parameters
+        ----------
+        callback_key : str
+            Key the stream's messages are routed under, e.g. "orderbook_BTC-USD".
+
+        callback : Callable
+            Coroutine called with each message.
+
+        subscription_key : str, optional
+            Key tracked in `active_subscriptions`. Defaults to `callback_key`
+            with its "orderbook_"/"trades_" prefix removed.
+        """
+        if subscription_key is None:
+            subscription_key = callback_key.replace("orderbook_", "").replace("trades_", "")
+        self.callbacks[callback_key] = (callback, subscription_key)
+
+        cb_id = self._callback_ids.get(callback_key)
+        if cb_id is None:
+            self._callback_ids[callback_key] = len(self._hot_callbacks)
+            self._hot_callbacks.append(callback)
+        else:
+            self._hot_callbacks[cb_id] = callback
+
     @abstractmethod
     async def close(self) -> None:
         pass
@@ -47,12 +84,208 @@ class Data(ABC):
     
 class MultiStreamData(Data):
     
-    def __init__(self, api_key: str, api_secret: str):
+    def __init__(self, api_key: str, api_secret: str, multiplex: bool = False):
         super().__init__(api_key, api_secret)
+        # Whether the venue carries many streams over one socket, picks the transport
+        # used by `subscribe_streams`
+        self.multiplex = multiplex
         self.connections = {}
         self.managed_subscriptions = set()
         self._shutting_down = False
+        # Typed decoders per callback key, streams without one are parsed with orjson
+        self.decoders: Dict[str, msgspec.json.Decoder] = {}
+
+        # Parsed messages are queued per callback key and drained in batches, so a
+        # burst costs one callback dispatch instead of one per frame
+        self.stream_queue_maxsize = 1024
+        self.batch_callbacks: Dict[str, Callable] = {}
+        self._stream_queues: Dict[str, asyncio.Queue] = {}
+        self._drain_tasks: Dict[str, asyncio.Task] = {}
+        # Frames dropped on a full queue per callback key since its last resync, see
+        # `_on_stream_gap` and `clear_stream_gap`
+        self.stream_gaps: Dict[str, int] = {}
+
+        # Subscribe frames serialized once per subscription key and resent on every reconnect
+        self._sub_payloads: Dict[str, str] = {}
+
+        # Multiplexed sockets: precompiled patterns that pick a frame's stream from its
+        # first `router_scan_bytes` before any decoding, by connection callback key.
+        # Routed frames are `{route_field: tag, envelope_field: payload}` envelopes; only
+        # the payload reaches the stream's decoder and callbacks
+        self.route_field = "stream"
+        self.envelope_field = "data"
+        self.router_scan_bytes = 64
+        self._raw_routers: Dict[str, Tuple[re.Pattern, re.Pattern]] = {}
+        self._route_tags: Dict[str, str] = {}
+        self._enveloped = set()
+        self._envelope_decoder: msgspec.json.Decoder | None = None
+
+    def register_decoder(self, callback_key: str, schema: type) -> None:
+        """
+        Decode frames for `callback_key` directly into `schema` (e.g. `DepthMsg`).
+
+        Non-strict, so numeric fields sent as JSON strings are coerced.
+        """
+        self.decoders[callback_key] = msgspec.json.Decoder(schema, strict=False)
     
+    def register_handler(self, callback_key: str, handler: Handler | DuplexHandler, subscription_key: str | None = None) -> None:
+        """
+        Wire a handler to a stream: its `on_update` as the callback, its `on_batch`
+        for drained batches and, if it declares a `schema`, a typed decoder.
+        `DuplexHandler` has neither of the latter, so its messages are replayed one
+        by one and parsed with orjson.
+        """
+        self.register_callback(callback_key, handler.on_update, subscription_key)
+        on_batch = getattr(handler, "on_batch", None)
+        if on_batch is not None:
+            self.batch_callbacks[callback_key] = on_batch
+        schema = getattr(handler, "schema", None)
+        if schema is not None:
+            self.register_decoder(callback_key, schema)
+
+    def set_subscription_payload(self, subscription_key: str, payload: Dict | List) -> None:
+        """
+        Serialize the subscribe message for `subscription_key` once; it is sent on
+        connect and on every reconnect by `_handle_subscription_messages_with_resilience`.
+
+        Kept as text since most venues reject subscribe requests sent as binary frames.
+        """
+        self._sub_payloads[subscription_key] = orjson.dumps(payload).decode()
+
+    async def subscribe_streams(
+        self,
+        ws_url: str,
+        streams: List[Tuple[str, Dict | List]],
+        subscription_key: str = "multiplex",
+        headers: Dict[str, str] | None = None,
+    ) -> None:
+        """
+        Subscribe to several streams with the transport picked at construction: one
+        shared socket through `subscribe_multi` when `multiplex` is set, otherwise
+        one resilient socket per stream, each tracked under its own subscription key.
+
+        Parameters are as for `subscribe_multi`; `subscription_key` is only used for
+        the shared socket.
+        """
+        if self.multiplex:
+            await self.subscribe_multi(ws_url, streams, subscription_key, headers=headers)
+            return
+
+        tasks = []
+        for callback_key, payload in streams:
+            stream_subscription_key = self.callbacks[callback_key][1]
+            self.set_subscription_payload(stream_subscription_key, payload)
+            tasks.append(self._handle_subscription_messages_with_resilience(
+                ws_url, callback_key, stream_subscription_key, headers=headers
+            ))
+        await asyncio.gather(*tasks)
+
+    async def subscribe_multi(
+        self,
+        ws_url: str,
+        streams: List[Tuple[str, Dict | List]],
+        subscription_key: str = "multiplex",
+        headers: Dict[str, str] | None = None,
+    ) -> None:
+        """
+        Carry several streams over one websocket, for venues that multiplex.
+
+        Callbacks for each stream must already be registered under their callback
+        keys. The payloads are merged into a single subscribe frame by
+        `_merge_subscription_payloads`, and every received message is routed back
+        to its stream's callback by `_route_message`.
+
+        Parameters
+        ----------
+        ws_url : str
+            The websocket URL.
+
+        streams : List[Tuple[str, Dict | List]]
+            (callback_key, subscribe payload) per stream.
+
+        subscription_key : str
+            Key the shared connection is tracked under.
+
+        headers : Dict[str, str], optional
+            Extra headers for the handshake.
+        """
+        self.set_subscription_payload(
+            subscription_key, self._merge_subscription_payloads([payload for _, payload in streams])
+        )
+        self.register_callback(subscription_key, self._demux_message, subscription_key)
+        self._build_router(subscription_key, [callback_key for callback_key, _ in streams])
+        await self._handle_subscription_messages_with_resilience(
+            ws_url, subscription_key, subscription_key, headers=headers
+        )
+
+    def _merge_subscription_payloads(self, payloads: List[Dict | List]) -> Dict | List:
+        """
+        Combine per-stream subscribe payloads into one frame. Defaults to the common
+        {"method": "subscribe", "params": [...]} shape; override for other venues.
+        """
+        params = []
+        for payload in payloads:
+            params.extend(payload.get("params", ()))
+        return {"method": "subscribe", "params": params}
+
+    def _build_router(self, connection_key: str, callback_keys: List[str]) -> None:
+        """
+        Compile one alternation over the venue tags of `callback_keys` matching
+        `"<route_field>":"<tag>"`, in str and bytes flavours since frames can arrive
+        either way, and the envelope decoder shared by every routed stream.
+        """
+        tags = {self._stream_tag(key): key for key in callback_keys}
+        self._route_tags.update(tags)
+        self._enveloped.update(callback_keys)
+        self._enveloped.add(connection_key)
+
+        alternation = "|".join(re.escape(tag) for tag in sorted(tags, key=len, reverse=True))
+        source = r'"%s"\s*:\s*"(%s)"' % (re.escape(self.route_field), alternation)
+        self._raw_routers[connection_key] = (re.compile(source), re.compile(source.encode()))
+
+        envelope = msgspec.defstruct(
+            "Envelope",
+            [("tag", Optional[str], None), ("data", msgspec.Raw, msgspec.Raw(b"null"))],
+            rename={"tag": self.route_field, "data": self.envelope_field},
+        )
+        self._envelope_decoder = msgspec.json.Decoder(envelope)
+
+    def _stream_tag(self, callback_key: str) -> str:
+        """
+        Tag the venue puts in `route_field` for `callback_key`'s frames. Defaults to
+        the key itself; override when they differ, e.g. "btcusdt@depth" for
+        "orderbook_BTC", along with `_callback_key_for_tag`.
+        """
+        return callback_key
+
+    def _callback_key_for_tag(self, tag: str) -> str | None:
+        """
+        Callback key for the venue tag of a routed frame, or None if it isn't ours.
+        """
+        return self._route_tags.get(tag)
+
+    def _route_message(self, envelope: Any) -> str | None:
+        """
+        Callback key for a decoded envelope received on a multiplexed socket, or None
+        to drop it (acks, unknown streams). Override to match the venue.
+        """
+        return self._callback_key_for_tag(envelope.tag) if envelope.tag is not None else None
+
+    async def _demux_message(self, envelope: Any) -> None:
+        callback_key = self._route_message(envelope)
+        if callback_key is None:
+            return
+        entry = self.callbacks.get(callback_key)
+        if entry is None:
+            self.logging.warning("No callback registered for %s", callback_key)
+            return
+        try:
+            data = self._payload_decoder(callback_key)(envelope.data)
+        except ValueError:
+            self.logging.warning("Invalid JSON received on %s, first: %s", callback_key, bytes(envelope.data))
+            return
+        await entry[0](data)
+
     async def subscribe_orderbook(self, symbol: str, callback: Callable) -> None:
         pass
     
@@ -67,18 +300,22 @@ class MultiStreamData(Data):
         Close all WebSocket connections.
         """
         self._shutting_down = True
+        for task in self._drain_tasks.values():
+            task.cancel()
+        self._drain_tasks.clear()
+        self._stream_queues.clear()
         # Prefer closing currently tracked subscriptions
         for subscription_key, ws_connection in self.subscriptions.items():
             try:
                 await ws_connection.close()
             except Exception as e:
-                self.logging.error(f"Error closing connection for {subscription_key}: {e}")
+                self.logging.error("Error closing connection for %s: %s", subscription_key, e)
         # Close any legacy-tracked connections if present
         for subscription_key, ws_connection in self.connections.items():
             try:
                 await ws_connection.close()
             except Exception as e:
-                self.logging.error(f"Error closing legacy connection for {subscription_key}: {e}")
+                self.logging.error("Error closing legacy connection for %s: %s", subscription_key, e)
         
         # Clear subscriptions
         self.subscriptions.clear()
@@ -91,36 +328,156 @@ class MultiStreamData(Data):
         """
         try:
             async for message in ws_connection:
-                try:
-                    data = json.loads(message)
-                    await self._process_subscription_message(data, callback_key)
-                except json.JSONDecodeError:
-                    self.logging.warning(f"Invalid JSON received on {callback_key}: {message}")
-                except Exception as e:
-                    self.logging.error(f"Error processing message for {callback_key}: {e}")
+                self._enqueue_message(message, callback_key)
         except websockets.exceptions.ConnectionClosed as e:
             self.logging.warning(
-                f"WebSocket connection closed for {callback_key}: code={getattr(e, 'code', None)} reason={getattr(e, 'reason', '')}"
+                "WebSocket connection closed for %s: code=%s reason=%s",
+                callback_key, getattr(e, 'code', None), getattr(e, 'reason', ''),
             )
             # Remove from active subscriptions
-            subscription_key = callback_key.replace("orderbook_", "").replace("trades_", "")
-            if subscription_key in self.active_subscriptions:
-                self.active_subscriptions.remove(subscription_key)
+            entry = self.callbacks.get(callback_key)
+            if entry is not None:
+                self.active_subscriptions.discard(entry[1])
         except Exception as e:
-            self.logging.error(f"WebSocket handler error for {callback_key}: {e}")
+            self.logging.error("WebSocket handler error for %s: %s", callback_key, e)
     
+    def _payload_decoder(self, callback_key: str) -> Callable:
+        decoder = self.decoders.get(callback_key)
+        if decoder is not None:
+            return decoder.decode
+        return lambda raw: orjson.loads(memoryview(raw))
+
+    def _decoder_for(self, callback_key: str) -> Callable:
+        """
+        Decoder for the frames queued under `callback_key`. A multiplexed connection's
+        own queue yields envelopes for `_demux_message`; routed streams unwrap the
+        envelope and decode only its payload.
+        """
+        if callback_key not in self._enveloped:
+            decoder = self.decoders.get(callback_key)
+            return decoder.decode if decoder is not None else orjson.loads
+
+        unwrap = self._envelope_decoder.decode
+        if callback_key in self._raw_routers:
+            return unwrap
+        decode = self._payload_decoder(callback_key)
+        return lambda message: decode(unwrap(message).data)
+
+    def _enqueue_message(self, message: str | bytes, callback_key: str) -> None:
+        """
+        Queue a raw frame for its stream's drain task, starting the task on first use.
+
+        Frames from a multiplexed socket are routed to their stream's own queue when
+        the precompiled router finds the stream tag, scanning the whole frame only if
+        it isn't in the first `router_scan_bytes`, so every frame of a stream takes the
+        same queue and stays in order. Anything else (acks, unknown streams) goes
+        through `_demux_message` after decoding.
+        """
+        routers = self._raw_routers.get(callback_key)
+        if routers is not None:
+            router = routers[not isinstance(message, str)]
+            match = router.search(message, 0, self.router_scan_bytes)
+            if match is None and len(message) > self.router_scan_bytes:
+                match = router.search(message)
+            if match is not None:
+                tag = match.group(1)
+                routed = self._callback_key_for_tag(tag if isinstance(tag, str) else tag.decode())
+                if routed is not None:
+                    callback_key = routed
+
+        queue = self._stream_queues.get(callback_key)
+        if queue is None:
+            queue = asyncio.Queue(maxsize=self.stream_queue_maxsize)
+            self._stream_queues[callback_key] = queue
+            self._drain_tasks[callback_key] = asyncio.create_task(self._drain_stream(queue, callback_key))
+        try:
+            queue.put_nowait(message)
+        except asyncio.QueueFull:
+            dropped = self.stream_gaps.get(callback_key, 0)
+            self.stream_gaps[callback_key] = dropped + 1
+            if dropped == 0:
+                # Warn once per gap, a full queue otherwise logs every frame of the burst
+                self.logging.warning("Stream queue full for %s, dropping messages until resync", callback_key)
+                self._on_stream_gap(callback_key)
+
+    def _on_stream_gap(self, callback_key: str) -> None:
+        """
+        Called when `callback_key` first drops a frame. Sequenced streams (orderbook
+        deltas) now have a hole, so override to resubscribe or fetch a snapshot and
+        call `clear_stream_gap` once the stream is consistent again.
+        """
+        pass
+
+    def clear_stream_gap(self, callback_key: str) -> int:
+        """
+        Mark `callback_key` as resynced, returning how many frames it dropped.
+        """
+        dropped = self.stream_gaps.pop(callback_key, 0)
+        if dropped:
+            self.logging.info("Stream %s resynced after dropping %d messages", callback_key, dropped)
+        return dropped
+
+    async def _drain_stream(self, queue: asyncio.Queue, callback_key: str) -> None:
+        """
+        Wait for a frame, take everything else already queued, decode the lot and
+        process it as one batch. Undecodable frames are logged once per batch.
+        """
+        decode = self._decoder_for(callback_key)
+        cb_id = self._callback_ids.get(callback_key)
+        while True:
+            messages = [await queue.get()]
+            while not queue.empty():
+                messages.append(queue.get_nowait())
+
+            items = []
+            bad = []
+            for message in messages:
+                try:
+                    items.append(decode(message))
+                except ValueError:
+                    bad.append(message)
+
+            if bad:
+                self.logging.warning("Invalid JSON received on %s (%d frames), first: %s", callback_key, len(bad), bad[0])
+            if items:
+                await self._process_subscription_batch(items, callback_key, cb_id)
+
+    async def _process_subscription_batch(self, items: List[Any], callback_key: str, cb_id: int | None = None) -> None:
+        """
+        Hand a batch to the stream's batch callback, or replay it message by message
+        through the callback registered under `cb_id`.
+        """
+        batch_callback = self.batch_callbacks.get(callback_key)
+        if batch_callback is None:
+            if cb_id is None:
+                for data in items:
+                    await self._process_subscription_message(data, callback_key)
+                return
+            callback = self._hot_callbacks[cb_id]
+            for data in items:
+                try:
+                    await callback(data)
+                except Exception as e:
+                    self.logging.error("Error in callback for %s: %s", callback_key, e)
+            return
+        try:
+            await batch_callback(items)
+        except Exception as e:
+            self.logging.error("Error in batch callback for %s: %s", callback_key, e)
+
     async def _process_subscription_message(self, data: Dict, callback_key: str) -> None:
         """
         Process messages from specific subscriptions and route to appropriate callbacks.
         """
         try:
-            if callback_key in self.callbacks:
+            entry = self.callbacks.get(callback_key)
+            if entry is not None:
                 # Call the registered callback with the data
-                await self.callbacks[callback_key](data)
+                await entry[0](data)
             else:
-                self.logging.warning(f"No callback registered for {callback_key}")
+                self.logging.warning("No callback registered for %s", callback_key)
         except Exception as e:
-            self.logging.error(f"Error in callback for {callback_key}: {e}")
+            self.logging.error("Error in callback for %s: %s", callback_key, e)
 
     async def _handle_subscription_messages_with_resilience(
         self,
@@ -138,6 +495,7 @@ class MultiStreamData(Data):
 
         - Stores the active connection in `self.subscriptions[subscription_key]`
         - Adds/removes `subscription_key` in `self.active_subscriptions`
+        - Sends the cached subscribe frame for `subscription_key`, if any, after connecting
         - Calls `_process_subscription_message` for each received message
         - Logs detailed close code and reason when the connection drops
         """
@@ -146,7 +504,7 @@ class MultiStreamData(Data):
         while not self._shutting_down:
             ws_connection = None
             try:
-                connect_kwargs = {}
+                connect_kwargs = dict(self.ws_connect_kwargs)
                 if headers is not None:
                     connect_kwargs["extra_headers"] = headers
                 if ping_interval is not None:
@@ -156,30 +514,28 @@ class MultiStreamData(Data):
 
                 ws_connection = await websockets.connect(ws_url, **connect_kwargs)
 
+                sub_payload = self._sub_payloads.get(subscription_key)
+                if sub_payload is not None:
+                    await ws_connection.send(sub_payload)
+
                 # Mark active and store connection
                 self.subscriptions[subscription_key] = ws_connection
                 self.active_subscriptions.add(subscription_key)
-                print(f"Connected websocket for {callback_key} ({subscription_key})")
-                self.logging.info(f"Connected websocket for {callback_key} ({subscription_key})")
+                self.logging.info("Connected websocket for %s (%s)", callback_key, subscription_key)
 
                 # Reset backoff on successful connect
                 backoff_seconds = backoff_initial_seconds
 
                 async for message in ws_connection:
-                    try:
-                        data = json.loads(message)
-                        await self._process_subscription_message(data, callback_key)
-                    except json.JSONDecodeError:
-                        self.logging.warning(f"Invalid JSON received on {callback_key}: {message}")
-                    except Exception as e:
-                        self.logging.error(f"Error processing message for {callback_key}: {e}")
+                    self._enqueue_message(message, callback_key)
 
             except websockets.exceptions.ConnectionClosed as e:
                 self.logging.warning(
-                    f"WebSocket connection closed for {callback_key} ({subscription_key}): code={getattr(e, 'code', None)} reason={getattr(e, 'reason', '')}"
+                    "WebSocket connection closed for %s (%s): code=%s reason=%s",
+                    callback_key, subscription_key, getattr(e, 'code', None), getattr(e, 'reason', ''),
                 )
             except Exception as e:
-                self.logging.error(f"WebSocket handler error for {callback_key} ({subscription_key}): {e}")
+                self.logging.error("WebSocket handler error for %s (%s): %s", callback_key, subscription_key, e)
             finally:
                 # Cleanup
                 if subscription_key in self.active_subscriptions:
@@ -207,8 +563,8 @@ class SingleStreamData(Data):
     
     async def connect(self) -> None:
         try:
-            self.logging.info(f"Connecting to exchange websocket streams...")
-            self.ws = await websockets.connect(self.WS_URL)
+            self.logging.info("Connecting to exchange websocket streams...")
+            self.ws = await websockets.connect(self.WS_URL, **self.ws_connect_kwargs)
             asyncio.create_task(self.ws_message_handler())
         except:
             self.logging.error("Failed to connect to exchange websocket streams.")
@@ -222,21 +578,22 @@ class SingleStreamData(Data):
         try:
             async for message in self.ws:
                 try:
-                    data = json.loads(message)
+                    data = orjson.loads(message)
                     await self._process_ws_message(data)
-                except json.JSONDecodeError:
-                    self.logging.warning(f"Invalid JSON received: {message}")
+                except orjson.JSONDecodeError:
+                    self.logging.warning("Invalid JSON received: %s", message)
                 except Exception as e:
-                    self.logging.error(f"Error processing WebSocket message: {e}")
+                    self.logging.error("Error processing WebSocket message: %s", e)
         except websockets.exceptions.ConnectionClosed as e:
             self.logging.warning(
-                f"WebSocket connection closed: code={getattr(e, 'code', None)} reason={getattr(e, 'reason', '')}"
+                "WebSocket connection closed: code=%s reason=%s",
+                getattr(e, 'code', None), getattr(e, 'reason', ''),
             )
             # Attempt reconnection
             await asyncio.sleep(5)
             await self.connect()
         except Exception as e:
-            self.logging.error(f"WebSocket handler error: {e}")
+            self.logging.error("WebSocket handler error: %s", e)
     
     @abstractmethod
     async def _process_ws_message(self, data: Dict) -> None:
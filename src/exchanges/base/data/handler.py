@@ -1,14 +1,22 @@
 from abc import ABC, abstractmethod
-from typing import Any, Optional, Dict
+from typing import Any, Optional, Dict, List
 
 from src.core.event_bus import MultiEventBus
 
 
 class Handler(ABC):
+    # Struct the stream's frames decode into (e.g. `DepthMsg`); when set,
+    # `MultiStreamData.register_handler` decodes straight into it, so `_process`
+    # gets typed objects and publishes them onto the bus without any re-parsing
+    schema: Optional[type] = None
+
     def __init__(self, queue: MultiEventBus, stream_key: str, event_type: Optional[str] = None):
         self._queue = queue
+        self._bus = queue.bus_for(stream_key)
         self.event_type = event_type
         self.stream_key = stream_key
+        # Bound once so the per-message call skips the method lookup
+        self._process_cached = self._process
     
     @abstractmethod
     def _process(self, data: Any) -> Any:
@@ -20,17 +28,42 @@ class Handler(ABC):
     
     async def _publish(self, data: Any) -> None:
         if self.event_type is not None:
-            await self._queue.put(self.stream_key, self.event_type, data)
+            await self._bus.put(self.event_type, data)
 
     async def on_update(self, data: Any) -> None:
-        processed_data = self._process(data)
-        if processed_data is not None:
-            await self._publish(processed_data)
+        processed_data = self._process_cached(data)
+        if processed_data is None or self.event_type is None:
+            return
+        # Only suspend when the bus is full
+        if not self._bus.put_nowait(self.event_type, processed_data):
+            await self._bus.put(self.event_type, processed_data)
+
+    async def on_batch(self, items: List[Any]) -> None:
+        """
+        Handle several queued messages at once.
+
+        Defaults to one `on_update` per message; override to coalesce, e.g. apply
+        a run of orderbook deltas with `Orderbook.update_deltas` and publish once.
+        A failing message doesn't stop the rest of the batch; the first error is
+        raised once every message has been handled.
+        """
+        error = None
+        failed = 0
+        for data in items:
+            try:
+                await self.on_update(data)
+            except Exception as e:
+                failed += 1
+                if error is None:
+                    error = e
+        if error is not None:
+            raise RuntimeError(f"{failed} of {len(items)} messages failed, first: {error!r}") from error
 
 class DuplexHandler(ABC):
     def __init__(self, queue: MultiEventBus, event_type: Optional[str] = None):
         self._queue = queue
         self.event_type = event_type
+        self._process_cached = self._process
     
     @abstractmethod
     def _process(self, data: Any) -> Dict[str, Any]:
@@ -46,6 +79,11 @@ class DuplexHandler(ABC):
                 await self._queue.put(key, self.event_type, key_data)
 
     async def on_update(self, data: Any) -> None:
-        processed_data = self._process(data)
-        if processed_data is not None:
-            await self._publish(processed_data)
\ No newline at end of file
+        processed_data = self._process_cached(data)
+        if processed_data is None or self.event_type is None:
+            return
+        queue = self._queue
+        event_type = self.event_type
+        for key, key_data in processed_data.items():
+            if not queue.put_nowait(key, event_type, key_data):
+                await queue.put(key, event_type, key_data)
\ No newline at end of file
@@ -36,6 +36,9 @@ class Endpoints(ABC):
     ----------
     _endpoints_ : dict
         A dictionary to store the endpoint objects.
+
+    Each endpoint is also set as an instance attribute, so `endpoints.create_order`
+    is a normal attribute read rather than a `__getattr__` fallback.
     """
 
     def __init__(self) -> None:
@@ -54,6 +57,7 @@ class Endpoints(ABC):
             The respective endpoint object.
         """
         self._endpoints_[name] = endpoint
+        setattr(self, name, endpoint)
 
     def load_endpoints(self, endpoints: List[Endpoint]) -> None:
 
@@ -62,24 +66,11 @@ class Endpoints(ABC):
 
     def __getattr__(self, name: str) -> Endpoint:
         """
-        Get an endpoint by name.
-
-        Parameters
-        ----------
-        name : str
-            The name of the endpoint.
-
-        Returns
-        -------
-        Endpoint
-            The endpoint object.
+        Only reached when `name` was never added as an endpoint.
 
         Raises
         ------
         AttributeError
-            If the endpoint name does not exist in the endpoints dictionary.
+            Always, naming the missing endpoint.
         """
-        try:
-            return self._endpoints_[name]
-        except KeyError:
-            raise AttributeError(f"'Endpoints' object has no attribute '{name}'")
+        raise AttributeError(f"'Endpoints' object has no attribute '{name}'")
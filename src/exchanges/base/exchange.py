@@ -5,7 +5,7 @@ from typing import Dict, Union, List
 from src.utils.logging.logger import Logger
 from src.exchanges.base.client import Client
 from src.exchanges.base.formats import Formats
-from src.exchanges.base.endpoints import Endpoints
+from src.exchanges.base.endpoints import Endpoint, Endpoints
 from src.exchanges.base.constants import Side, OrderType, TIF
 from src.exchanges.base.structures import Order
 
@@ -122,6 +122,109 @@ class Exchange(ABC):
         """
         pass
 
+    async def batch_cancel_replace(
+        self,
+        cancels: List[Order],
+        places: List[Order],
+        amends: List[Order],
+    ) -> List[Dict] | None:
+        """
+        Send cancels, new orders and amends in one signed request.
+
+        Parameters
+        ----------
+        cancels : List[Order]
+            Orders to cancel.
+
+        places : List[Order]
+            Orders to place.
+
+        amends : List[Order]
+            Orders to amend.
+
+        Returns
+        -------
+        List[Dict] | None
+            Per-order results in the order `cancels + places + amends`,
+            or None if the exchange has no batch endpoint.
+        """
+        payload = self.formats.batch_cancel_replace(cancels, places, amends)
+        if payload is None:
+            return None
+        return await self._send_batch(self.endpoints.batch_cancel_replace, payload)
+
+    async def bulk_create_order(self, orders: List[Order]) -> List[Dict] | None:
+        """
+        Create several orders in one signed request.
+
+        Parameters
+        ----------
+        orders : List[Order]
+            The orders to send to the exchange.
+
+        Returns
+        -------
+        List[Dict] | None
+            Per-order results, or None if the exchange has no bulk endpoint.
+        """
+        payload = self.formats.bulk_create_order(orders)
+        if payload is None:
+            return None
+        return await self._send_batch(self.endpoints.bulk_create_order, payload)
+
+    async def bulk_amend_order(self, orders: List[Order]) -> List[Dict] | None:
+        """
+        Amend several orders in one signed request.
+
+        Parameters
+        ----------
+        orders : List[Order]
+            The orders to modify/amend.
+
+        Returns
+        -------
+        List[Dict] | None
+            Per-order results, or None if the exchange has no bulk endpoint.
+        """
+        payload = self.formats.bulk_amend_order(orders)
+        if payload is None:
+            return None
+        return await self._send_batch(self.endpoints.bulk_amend_order, payload)
+
+    async def bulk_cancel_order(self, orders: List[Order]) -> List[Dict] | None:
+        """
+        Cancel several orders in one signed request.
+
+        Parameters
+        ----------
+        orders : List[Order]
+            The orders to cancel.
+
+        Returns
+        -------
+        List[Dict] | None
+            Per-order results, or None if the exchange has no bulk endpoint.
+        """
+        payload = self.formats.bulk_cancel_order(orders)
+        if payload is None:
+            return None
+        return await self._send_batch(self.endpoints.bulk_cancel_order, payload)
+
+    async def _send_batch(self, endpoint: Endpoint, payload: Dict | List[Dict]) -> List[Dict] | Dict:
+        """
+        Send a preformatted multi-order payload to `endpoint`.
+
+        A failed request yields an empty list rather than None, so callers never
+        mistake a transport error for a missing batch endpoint and resend.
+        """
+        response = await self.client.request(
+            url=self.base_endpoint.url + endpoint.url,
+            method=endpoint.method,
+            headers=dict(self.client.default_headers),
+            data=payload,
+        )
+        return response if response is not None else []
+
     async def shutdown(self) -> None:
             await self.logging.info(topic="EXCH", msg=f"Shutting down...")
             await self.client.shutdown()
\ No newline at end of file
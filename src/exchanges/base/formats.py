@@ -1,8 +1,12 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Union, List
+from typing import Callable, Dict, Union, List, Tuple
+import math
 
 from src.exchanges.base.structures import Order
 from src.exchanges.base.constants import (
+    Side,
+    OrderType,
+    TIF,
     SideConverter,
     OrderTypeConverter,
     TimeInForceConverter,
@@ -10,9 +14,27 @@ from src.exchanges.base.constants import (
 )
 
 
+_LITERAL_TYPES = (str, int, float, bool, type(None))
+
+
+def _is_literal(value) -> bool:
+    """
+    Whether repr(value) is valid source for value. Exact types only, since enum
+    members subclass int/str, and finite floats only, since repr(nan) is just `nan`.
+    """
+    if type(value) not in _LITERAL_TYPES:
+        return False
+    return type(value) is not float or math.isfinite(value)
+
+
 class Formats(ABC):
     recvWindow = 1000
 
+    # Body keys for the per-order fields filled in by compiled order builders
+    price_key = "price"
+    amount_key = "qty"
+    cloid_key = "cloid"
+
     def __init__(
         self,
         convert_side: SideConverter | None,
@@ -25,6 +47,7 @@ class Formats(ABC):
         self.convert_tif = convert_time_in_force
         self.convert_symbol = convert_symbol
         self.MAX_CANDLES = 5000
+        self._builders: Dict[Tuple[str, OrderType, Side, TIF], Callable | None] = {}
 
     @abstractmethod
     def create_order(self, order: Order) -> Dict:
@@ -94,6 +117,64 @@ class Formats(ABC):
         """
         pass
 
+    def order_static_fields(self, symbol: str, order_type: OrderType, side: Side, tif: TIF) -> Dict | None:
+        """
+        The part of a create order body that is fixed for a (symbol, order type, side, tif),
+        already converted to exchange values. Exchanges that support compiled builders
+        override this; the default (None) disables them.
+        """
+        pass
+
+    def compile_order_builder(self, symbol: str, order_type: OrderType, side: Side, tif: TIF) -> Callable | None:
+        """
+        Generate and cache a function `(price, amount, cloid) -> Dict` returning the full
+        create order body, with the static fields baked in as constants.
+
+        Returns
+        -------
+        Callable | None
+            The builder, or None if `order_static_fields` is not implemented.
+        """
+        key = (symbol, order_type, side, tif)
+        static = self.order_static_fields(symbol, order_type, side, tif)
+        if static is None:
+            self._builders[key] = None
+            return None
+
+        namespace = {}
+        items = []
+        for i, (field, value) in enumerate(static.items()):
+            if _is_literal(value):
+                items.append(f"{field!r}: {value!r}")
+            else:
+                namespace[f"_v{i}"] = value
+                items.append(f"{field!r}: _v{i}")
+        items.append(f"{self.price_key!r}: price")
+        items.append(f"{self.amount_key!r}: amount")
+        items.append(f"{self.cloid_key!r}: cloid")
+
+        source = "def _build(price, amount, cloid):\n    return {" + ", ".join(items) + "}\n"
+        exec(source, namespace)
+        builder = namespace["_build"]
+        self._builders[key] = builder
+        return builder
+
+    def build_create_order(self, order: Order, tif: TIF) -> Dict | None:
+        """
+        Create order body via the cached compiled builder for the order's shape.
+
+        Returns None when the exchange has no compiled builder; the caller then
+        formats the order itself.
+        """
+        key = (order.symbol, order.order_type, order.side, tif)
+        try:
+            builder = self._builders[key]
+        except KeyError:
+            builder = self.compile_order_builder(order.symbol, order.order_type, order.side, tif)
+        if builder is None:
+            return None
+        return builder(order.price, order.amount, order.cloid)
+
     def bulk_amend_order(self, orders: List[Order]) -> List[Dict] | None:
         pass
 
@@ -101,4 +182,34 @@ class Formats(ABC):
         pass
     
     def bulk_create_order(self, orders: List[Order]) -> List[Dict] | None:
-        pass
\ No newline at end of file
+        pass
+
+    def batch_cancel_replace(
+        self,
+        cancels: List[Order],
+        places: List[Order],
+        amends: List[Order],
+    ) -> Dict | None:
+        """
+        Build a single request body carrying cancels, new orders and amends.
+
+        Exchanges without an atomic batch endpoint leave this unimplemented (None),
+        in which case callers fall back to the individual bulk methods.
+
+        Parameters
+        ----------
+        cancels : List[Order]
+            Orders to cancel.
+
+        places : List[Order]
+            Orders to place.
+
+        amends : List[Order]
+            Orders to amend.
+
+        Returns
+        -------
+        Dict | None
+            The request body, or None if batching is not supported.
+        """
+        pass
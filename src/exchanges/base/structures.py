@@ -1,72 +1,175 @@
 from src.exchanges.base.constants import Side, OrderType
 
 from typing import Optional, Dict, List
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+import sys
+import msgspec
+import numpy as np
+from numba import njit
+
+
+class BookLevel(msgspec.Struct):
+    """Single orderbook level as sent by the exchange, `{"p": ..., "q": ...}`"""
+    p: float
+    q: float
+
+
+class DepthMsg(msgspec.Struct):
+    """Orderbook snapshot/delta frame, decoded straight into typed levels"""
+    bids: List[BookLevel]
+    asks: List[BookLevel]
+    seq: int
+
+
+@njit(cache=True)
+def _apply_delta_side(px, qty, upd_px, upd_qty):
+    """
+    Apply quantity changes to one ascending-sorted book side.
+
+    Works in a single scratch buffer sized for the worst case (every update
+    inserting), so a delta costs one allocation instead of one per level.
+    Returns views over the live part of the buffer.
+    """
+    n = px.shape[0]
+    cap = n + upd_px.shape[0]
+    out_px = np.empty(cap, dtype=np.float64)
+    out_qty = np.empty(cap, dtype=np.float64)
+    out_px[:n] = px
+    out_qty[:n] = qty
+
+    for k in range(upd_px.shape[0]):
+        price = upd_px[k]
+        qty_change = upd_qty[k]
+        idx = np.searchsorted(out_px[:n], price)
+
+        if idx < n and out_px[idx] == price:
+            new_qty = out_qty[idx] + qty_change
+            if new_qty <= 0:
+                for i in range(idx, n - 1):
+                    out_px[i] = out_px[i + 1]
+                    out_qty[i] = out_qty[i + 1]
+                n -= 1
+            else:
+                out_qty[idx] = new_qty
+
+        elif qty_change > 0:
+            for i in range(n, idx, -1):
+                out_px[i] = out_px[i - 1]
+                out_qty[i] = out_qty[i - 1]
+            out_px[idx] = price
+            out_qty[idx] = qty_change
+            n += 1
+
+    return out_px[:n], out_qty[:n]
+
+
+def warmup_orderbook_kernels() -> None:
+    """Compile (or load from cache) the orderbook kernels before the first live delta"""
+    empty = np.empty(0, dtype=np.float64)
+    _apply_delta_side(empty, empty, np.ones(1, dtype=np.float64), np.ones(1, dtype=np.float64))
 
 
 class Orderbook:
+    __slots__ = ("size", "bid_px", "bid_qty", "ask_px", "ask_qty", "seq_id", "_bba", "_mid")
+
     def __init__(self, size: int = 100):
         self.size = size
-        self.bids = {}  # price -> quantity
-        self.asks = {}  # price -> quantity  
+        # Both sides sorted by ascending price: best bid is the last bid, best ask the first ask
+        self.bid_px = np.empty(0, dtype=np.float64)
+        self.bid_qty = np.empty(0, dtype=np.float64)
+        self.ask_px = np.empty(0, dtype=np.float64)
+        self.ask_qty = np.empty(0, dtype=np.float64)
         self.seq_id = 0
 
-    def update_snapshot(self, bids_data: List[Dict], asks_data: List[Dict], seq: int):
-        """Update with snapshot data (absolute quantities)"""
+        # Refreshed once per update so reads are plain attribute loads
+        self._bba = (0.0, 0.0, 0.0, 0.0)
+        self._mid = 0.0
+
+    def update_snapshot(self, bids_data: List[BookLevel], asks_data: List[BookLevel], seq: int):
+        """Update with snapshot data (absolute quantities), keeping the best `size` levels per side"""
         self.seq_id = seq
-        self.bids = {float(item['p']): float(item['q']) for item in bids_data}
-        self.asks = {float(item['p']): float(item['q']) for item in asks_data}
 
-    def update_delta(self, bids_data: List[Dict], asks_data: List[Dict], seq: int):
+        bid_px, bid_qty = self._sorted_side(bids_data)
+        ask_px, ask_qty = self._sorted_side(asks_data)
+
+        self.bid_px, self.bid_qty = bid_px[-self.size:], bid_qty[-self.size:]
+        self.ask_px, self.ask_qty = ask_px[:self.size], ask_qty[:self.size]
+        self._refresh_top()
+
+    @staticmethod
+    def _sorted_side(levels: List[BookLevel]):
+        """Build price/qty arrays for one side, sorted ascending by price"""
+        n = len(levels)
+        px = np.fromiter((item.p for item in levels), dtype=np.float64, count=n)
+        qty = np.fromiter((item.q for item in levels), dtype=np.float64, count=n)
+        order = np.lexsort((qty, px))
+        return px[order], qty[order]
+
+    def update_delta(self, bids_data: List[BookLevel], asks_data: List[BookLevel], seq: int):
         """Update with delta data (quantity changes)"""
         if seq <= self.seq_id:
             return
             
         self.seq_id = seq
-        
-        # Apply bid changes
-        for item in bids_data:
-            price, qty_change = float(item['p']), float(item['q'])
-            if price in self.bids:
-                new_qty = self.bids[price] + qty_change
-                if new_qty <= 0:
-                    del self.bids[price]
-                else:
-                    self.bids[price] = new_qty
-            elif qty_change > 0:
-                self.bids[price] = qty_change
-        
-        # Apply ask changes
-        for item in asks_data:
-            price, qty_change = float(item['p']), float(item['q'])
-            if price in self.asks:
-                new_qty = self.asks[price] + qty_change
-                if new_qty <= 0:
-                    del self.asks[price]
-                else:
-                    self.asks[price] = new_qty
-            elif qty_change > 0:
-                self.asks[price] = qty_change
+        self.bid_px, self.bid_qty = self._apply_delta(self.bid_px, self.bid_qty, bids_data)
+        self.ask_px, self.ask_qty = self._apply_delta(self.ask_px, self.ask_qty, asks_data)
+        self._refresh_top()
+
+    def update_deltas(self, deltas: List[DepthMsg]):
+        """Apply a run of delta messages in one pass per side, skipping stale sequence numbers"""
+        bids_data, asks_data = [], []
+        for msg in deltas:
+            if msg.seq <= self.seq_id:
+                continue
+            self.seq_id = msg.seq
+            bids_data.extend(msg.bids)
+            asks_data.extend(msg.asks)
+
+        if not bids_data and not asks_data:
+            return
+
+        self.bid_px, self.bid_qty = self._apply_delta(self.bid_px, self.bid_qty, bids_data)
+        self.ask_px, self.ask_qty = self._apply_delta(self.ask_px, self.ask_qty, asks_data)
+        self._refresh_top()
+
+    @staticmethod
+    def _apply_delta(px: np.ndarray, qty: np.ndarray, levels: List[BookLevel]):
+        """Apply quantity changes to one side"""
+        n = len(levels)
+        if not n:
+            return px, qty
+        upd_px = np.fromiter((item.p for item in levels), dtype=np.float64, count=n)
+        upd_qty = np.fromiter((item.q for item in levels), dtype=np.float64, count=n)
+        return _apply_delta_side(px, qty, upd_px, upd_qty)
+
+    def _refresh_top(self):
+        """Recompute the cached best bid/ask and mid from the current arrays"""
+        if len(self.bid_px):
+            best_bid_price, best_bid_qty = float(self.bid_px[-1]), float(self.bid_qty[-1])
+        else:
+            best_bid_price, best_bid_qty = 0.0, 0.0
+
+        if len(self.ask_px):
+            best_ask_price, best_ask_qty = float(self.ask_px[0]), float(self.ask_qty[0])
+        else:
+            best_ask_price, best_ask_qty = 0.0, 0.0
+
+        self._bba = (best_bid_price, best_bid_qty, best_ask_price, best_ask_qty)
+        if best_bid_price > 0 and best_ask_price > 0:
+            self._mid = (best_bid_price + best_ask_price) / 2.0
+        else:
+            self._mid = 0.0
 
     def get_bba(self):
-        """Get best bid and ask [bid_price, bid_qty, ask_price, ask_qty]"""
-        best_bid_price = max(self.bids.keys()) if self.bids else 0
-        best_bid_qty = self.bids.get(best_bid_price, 0) if best_bid_price else 0
-        
-        best_ask_price = min(self.asks.keys()) if self.asks else 0
-        best_ask_qty = self.asks.get(best_ask_price, 0) if best_ask_price else 0
-        
-        return [best_bid_price, best_bid_qty, best_ask_price, best_ask_qty]
+        """Get best bid and ask (bid_price, bid_qty, ask_price, ask_qty)"""
+        return self._bba
 
     def get_mid(self):
         """Get mid price"""
-        bba = self.get_bba()
-        if bba[0] > 0 and bba[2] > 0:
-            return (bba[0] + bba[2]) / 2.0
-        return 0.0
+        return self._mid
 
 
-@dataclass
+@dataclass(slots=True)
 class Order:
     symbol: str
     side: Side
@@ -75,4 +178,58 @@ class Order:
     order_type: OrderType
     cloid: Optional[str] = None
     oid: Optional[str] = None
-    tp: Optional[float] = None
\ No newline at end of file
+    tp: Optional[float] = None
+    _level: str = field(init=False, repr=False, compare=False, default="")
+    _level_cloid: Optional[str] = field(init=False, repr=False, compare=False, default=None)
+
+    @property
+    def level(self) -> str:
+        """
+        Level tag: the last 3 chars of the cloid, interned so hot-path equality is a
+        pointer check. Rederived whenever `cloid` changes, since quote orders only get
+        their cloid after they are built or taken from the pool.
+        """
+        cloid = self.cloid
+        if cloid is not self._level_cloid:
+            self._level_cloid = cloid
+            self._level = sys.intern(cloid[-3:]) if cloid else ""
+        return self._level
+
+    @classmethod
+    def acquire(
+        cls,
+        symbol: str,
+        side: Side,
+        amount: float,
+        price: float,
+        order_type: OrderType,
+        cloid: Optional[str] = None,
+        oid: Optional[str] = None,
+        tp: Optional[float] = None,
+    ) -> "Order":
+        """Take an order from the freelist (or build one) and set its fields"""
+        if not _ORDER_POOL:
+            return cls(symbol, side, amount, price, order_type, cloid, oid, tp)
+        order = _ORDER_POOL.pop()
+        order.symbol = symbol
+        order.side = side
+        order.amount = amount
+        order.price = price
+        order.order_type = order_type
+        order.cloid = cloid
+        order.oid = oid
+        order.tp = tp
+        return order
+
+    def release(self) -> None:
+        """Return the order to the freelist; it must not be referenced afterwards"""
+        if len(_ORDER_POOL) < _ORDER_POOL_MAX:
+            self.cloid = None
+            self.oid = None
+            self.tp = None
+            _ORDER_POOL.append(self)
+
+
+# Freelist for quote orders, which are rebuilt on every requote. Single event loop only.
+_ORDER_POOL: List[Order] = []
+_ORDER_POOL_MAX = 1024
\ No newline at end of file
@@ -1,7 +1,8 @@
 from typing import Dict, Any
 
 from src.utils.logging.logger import Logger
-from src.quoting_engines.volatility_estimator import VolatilityEstimator
+from src.exchanges.base.structures import Orderbook
+from src.quoting_engines.simple import VolatilityEstimator
 
 class LOBManager:
 
@@ -17,14 +18,15 @@ class LOBManager:
         self.volatility_estimator = VolatilityEstimator(window_size=30)
         self.vol = 0
 
-    def update_lob(self, data: Dict[str, Any]):
-        self.mid = data["mid"]
-        self.best_bid = data["best_bid"]["price"]
-        self.best_ask = data["best_ask"]["price"] 
+    def update_lob(self, ob: Orderbook):
+        bba = ob._bba
+        self.mid = ob._mid
+        self.best_bid = bba[0]
+        self.best_ask = bba[2]
         self.vol = self.volatility_estimator.update(self.mid)/self.mid
 
-    def update_usdcusdt_rate(self, data: Dict[str, Any]):
-        self.usdcusdt_rate = data["mid"]
+    def update_usdcusdt_rate(self, rate: float):
+        self.usdcusdt_rate = rate
 
     def get_lob(self) -> Dict[str, Any]:
         return {
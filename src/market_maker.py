@@ -1,23 +1,21 @@
 import asyncio
-import json
+from time import perf_counter_ns
 from symtable import Symbol
-from typing import Dict, Any
-from collections import defaultdict
+from typing import Dict, Any, List
 
 from src.utils.logging.logger import Logger
-from src.utils.misc_utils import time_ms, time_us
 from src.exchanges.base.exchange import Exchange
 from src.quoting_engines.simple import SimpleQuoter
 from src.OMS import OMS
 from src.position_manager import PositionManager
 from src.lob_manager import LOBManager
-from src.core.event_bus import MultiEventBus
+from src.core.event_bus import EventBus
 from src.core.events import Event
 from src.exchanges.base.constants import SymbolConverter
 
 class MarketMaker:
 
-    def __init__(self, symbol: str, config: Dict[str, Any], exchange: Exchange, logger: Logger, queue: MultiEventBus):
+    def __init__(self, symbol: str, config: Dict[str, Any], exchange: Exchange, logger: Logger, queue: EventBus):
 
         self.logger = logger
         self.exchange = exchange
@@ -31,9 +29,13 @@ class MarketMaker:
         self.has_usdcusdt = False
         
         # Add rate limiting for requotes
-        self.last_requote_time = 0
-        self.min_requote_interval = self.config["min_requote_interval"]  * 1000
+        self._min_requote_interval_ns = int(self.config["min_requote_interval"] * 1_000_000_000)
+        # perf_counter_ns has no fixed epoch and can be small just after boot, so start
+        # a full interval back to never rate-limit the first requote
+        self._last_requote_ns = -self._min_requote_interval_ns
 
+        # Handlers update state and return whether a requote is needed; the event
+        # loop requotes at most once per drained batch
         self.event_handlers = \
             {
                 "orderbook": self._on_orderbook_updates,
@@ -42,6 +44,9 @@ class MarketMaker:
                 "USDCUSDT": self._on_usdcusdt_updates,
             }
         
+        self.drain_max = 64
+        self._coalesced_types = frozenset(("orderbook", "USDCUSDT"))
+
         self.quoting_engine = SimpleQuoter(config, logger)
         self.oms = OMS(self.symbol, config, exchange, logger)
         self.position_manager = PositionManager(self.symbol, config, logger)
@@ -49,15 +54,20 @@ class MarketMaker:
 
         self.measure_t2t = True
         self.t2t_log_every = 100
-        self._t2t_stats = defaultdict(lambda: {"count": 0, "sum": 0.0, "max": 0.0})
+        # Stats as parallel count/sum/max lists indexed by event type, with a
+        # trailing slot for types that have no handler
+        self._t2t_types = [*self.event_handlers, "other"]
+        self._t2t_idx = {event_type: i for i, event_type in enumerate(self._t2t_types)}
+        self._t2t_count = [0] * len(self._t2t_types)
+        self._t2t_sum = [0.0] * len(self._t2t_types)
+        self._t2t_max = [0.0] * len(self._t2t_types)
 
         self.measure_requote_latency = True
         self.requote_log_every = 100
-        self._requote_stats = {
-            "quote_gen": {"count": 0, "sum": 0.0, "max": 0.0},
-            "oms_update": {"count": 0, "sum": 0.0, "max": 0.0},
-            "total": {"count": 0, "sum": 0.0, "max": 0.0}
-        }
+        self._requote_components = ("quote_gen", "oms_update", "total")
+        self._requote_count = [0, 0, 0]
+        self._requote_sum = [0, 0, 0]
+        self._requote_max = [0, 0, 0]
 
     async def start(self):
 
@@ -73,8 +83,25 @@ class MarketMaker:
     async def _process_events(self):
         while True:
             try:
-                event = await self.queue.get(self.symbol)
-                await self._process_event(event)
+                events = [await self.queue.get()]
+                events.extend(self.queue.drain_nowait(self.drain_max))
+
+                # Book and rate updates are snapshots, so only the newest of each
+                # type in a burst matters; everything else is handled in order
+                if len(events) > 1:
+                    events = self._coalesce(events)
+
+                needs_requote = False
+                for event in events:
+                    # One failing handler must not lose the rest of the batch
+                    try:
+                        if self._process_event(event):
+                            needs_requote = True
+                    except Exception as e:
+                        self.logger.error(f"MAKER {self.symbol} - Error processing {event.event_type} event: {e}")
+
+                if needs_requote:
+                    await self.requote()
             except asyncio.CancelledError:
                 self.logger.info(f"MAKER {self.symbol} - Event processing cancelled")
                 break
@@ -82,56 +109,73 @@ class MarketMaker:
                 self.logger.error(f"MAKER {self.symbol} - Error processing event: {e}")
                 await asyncio.sleep(0.5)
 
-    async def _process_event(self, event: Event) -> None:
+    def _coalesce(self, events: List[Event]) -> List[Event]:
+        latest = {}
+        for i, event in enumerate(events):
+            if event.event_type in self._coalesced_types:
+                latest[event.event_type] = i
+        if not latest:
+            return events
+        keep = set(latest.values())
+        return [
+            event for i, event in enumerate(events)
+            if event.event_type not in self._coalesced_types or i in keep
+        ]
+
+    def _process_event(self, event: Event) -> bool:
         if self.measure_t2t:
             try:
-                t2t_ms = time_ms() - event.ts_ms
+                t2t_ms = (perf_counter_ns() - event.ts_ns) / 1e6
                 self._record_t2t(event.event_type, t2t_ms)
             except Exception:
                 pass
 
         handler = self.event_handlers.get(event.event_type)
         if handler:
-            payload = json.loads(event.data) if isinstance(event.data, str) else event.data
-            await handler(payload)
-        else:
-            self.logger.debug(f"MAKER {self.symbol} - No handler for event type: {event.event_type}")
+            return handler(event.data)
+        if self.logger.is_enabled_for(10):
+            self.logger.debug("MAKER %s - No handler for event type: %s", self.symbol, event.event_type)
+        return False
 
     def _record_t2t(self, event_type: str, t2t_ms: float) -> None:
-        stats = self._t2t_stats[event_type]
-        stats["count"] += 1
-        stats["sum"] += t2t_ms
-        if t2t_ms > stats["max"]:
-            stats["max"] = t2t_ms
-
-        if stats["count"] % self.t2t_log_every == 0:
-            avg = stats["sum"] / stats["count"] if stats["count"] else 0.0
-            print(f"MAKER {self.symbol} - T2T {event_type}: last={t2t_ms:.1f}ms avg={avg:.1f}ms max={stats['max']:.1f}ms over {stats['count']} events")
+        i = self._t2t_idx.get(event_type, -1)
+        count = self._t2t_count[i] + 1
+        self._t2t_count[i] = count
+        self._t2t_sum[i] += t2t_ms
+        if t2t_ms > self._t2t_max[i]:
+            self._t2t_max[i] = t2t_ms
+
+        if count % self.t2t_log_every == 0:
+            avg = self._t2t_sum[i] / count
+            max_ms = self._t2t_max[i]
+            print(f"MAKER {self.symbol} - T2T {event_type}: last={t2t_ms:.1f}ms avg={avg:.1f}ms max={max_ms:.1f}ms over {count} events")
             self.logger.info(
-                f"MAKER {self.symbol} - T2T {event_type}: last={t2t_ms:.1f}ms avg={avg:.1f}ms max={stats['max']:.1f}ms over {stats['count']} events"
+                f"MAKER {self.symbol} - T2T {event_type}: last={t2t_ms:.1f}ms avg={avg:.1f}ms max={max_ms:.1f}ms over {count} events"
             )
 
-    def _record_requote_latency(self, component: str, latency_ms: float) -> None:
-        """Record requote component latency similar to T2T tracking"""
-        stats = self._requote_stats[component]
-        stats["count"] += 1
-        stats["sum"] += latency_ms
-        if latency_ms > stats["max"]:
-            stats["max"] = latency_ms
+    def _record_requote_latency(self, i: int, latency_ns: int) -> None:
+        """Record latency for requote component `i` (index into `_requote_components`)"""
+        count = self._requote_count[i] + 1
+        self._requote_count[i] = count
+        self._requote_sum[i] += latency_ns
+        if latency_ns > self._requote_max[i]:
+            self._requote_max[i] = latency_ns
 
-        if component == "total" and stats["count"] % self.requote_log_every == 0:
-            self._log_requote_stats(stats["count"])
+        if i == 2 and count % self.requote_log_every == 0:
+            self._log_requote_stats(count)
 
     def _log_requote_stats(self, count: int) -> None:
         """Log comprehensive requote latency statistics"""
         print("-"*20)
         output_lines = [f"MAKER {self.symbol} - REQUOTE LATENCY STATS (over {count} requotes):"]
         
-        for component, stats in self._requote_stats.items():
-            if stats["count"] > 0:
-                avg = stats["sum"] / stats["count"]
+        for i, component in enumerate(self._requote_components):
+            n = self._requote_count[i]
+            if n > 0:
+                # Recorded in ns, reported in us
+                avg = self._requote_sum[i] / n / 1_000
                 output_lines.append(
-                    f"  {component.upper()}: avg={avg:.1f}us max={stats['max']:.1f}us"
+                    f"  {component.upper()}: avg={avg:.1f}us max={self._requote_max[i] / 1_000:.1f}us"
                 )
         
         for line in output_lines:
@@ -140,46 +184,43 @@ class MarketMaker:
         
         self.logger.info("\n".join(output_lines))
 
-    async def _on_usdcusdt_updates(self, data):
+    def _on_usdcusdt_updates(self, data) -> bool:
         self.has_usdcusdt = True
         self.lob_manager.update_usdcusdt_rate(data)
-        await self.requote()
+        return True
 
-    async def _on_orderbook_updates(self, data):
+    def _on_orderbook_updates(self, data) -> bool:
         self.lob_manager.update_lob(data)
         self.has_orderbook = True
-        await self.requote()
+        return True
 
-    async def _on_position_updates(self, data):
+    def _on_position_updates(self, data) -> bool:
         self.position_manager.update_positions(data)
         self.has_position = True
-        await self.requote()
+        return True
         
-    async def _on_order_updates(self, data):
-        requote_on_filled = self.oms.update_orders_state(data)
-        if requote_on_filled:
-            await self.requote(forced_requote = False)
+    def _on_order_updates(self, data) -> bool:
+        return bool(self.oms.update_orders_state(data))
 
     async def requote(self, forced_requote = False):
-        current_time = time_ms()
+        t1 = perf_counter_ns()
         
-        if not forced_requote and (current_time - self.last_requote_time) < self.min_requote_interval:
+        if not forced_requote and (t1 - self._last_requote_ns) < self._min_requote_interval_ns:
             return
-        self.last_requote_time = current_time
+        self._last_requote_ns = t1
     
-        t1 = time_us()
         lob = self.lob_manager.get_lob()
         pos = self.position_manager.get_position(self.exch_symbol)
         quotes = self.quoting_engine.generate_quote_v2(lob, pos, forced_requote)
-        t2 = time_us()
+        t2 = perf_counter_ns()
         if quotes != []:
             await self.oms.update(quotes, lob)
-            t3 = time_us()
+            t3 = perf_counter_ns()
             if self.measure_requote_latency:
                 quote_gen_latency = (t2 - t1)
                 oms_latency = (t3 - t2) 
                 total_latency = (t3 - t1)
-                self._record_requote_latency("quote_gen", quote_gen_latency)
-                self._record_requote_latency("oms_update", oms_latency)
-                self._record_requote_latency("total", total_latency)
+                self._record_requote_latency(0, quote_gen_latency)
+                self._record_requote_latency(1, oms_latency)
+                self._record_requote_latency(2, total_latency)
     
\ No newline at end of file
@@ -1,12 +1,153 @@
 from typing import Dict, Any, List, Tuple
+import math
 import numpy as np
+from numba import njit
 
 from src.utils.logging.logger import Logger
 from src.exchanges.base.structures import Order
 from src.exchanges.base.constants import Side, OrderType
-from src.utils.rounding_utils import round_step
-from src.utils.calc_utils import nbabs, nblinspace, geometric_weights
-from src.quoting_engines.volatility_estimator import VolatilityEstimator
+from src.utils.rounding_utils import step_precision, STEP_FLOOR_SLACK
+from src.utils.calc_utils import geometric_weights
+
+@njit(cache=True)
+def _linspace_into(out: np.ndarray, start: float, end: float) -> None:
+    """Same values as np.linspace(start, end, len(out)), written into `out`"""
+    n = out.shape[0]
+    if n == 1:
+        out[0] = start
+        return
+    step = (end - start) / (n - 1)
+    for i in range(n - 1):
+        out[i] = start + i * step
+    out[n - 1] = end
+
+
+@njit(cache=True)
+def _round_step_into(out: np.ndarray, step: float, inv_step: float, precision: int) -> None:
+    """In-place `round_step_array(out, step, inv_step, precision)`"""
+    for i in range(out.shape[0]):
+        out[i] = math.floor(out[i] * inv_step * STEP_FLOOR_SLACK) * step
+    np.round(out, precision, out)
+
+
+@njit(cache=True)
+def linspace_round(out: np.ndarray, start: float, end: float, step: float, inv_step: float, precision: int) -> None:
+    """Step-rounded np.linspace(start, end, len(out)), written into `out`"""
+    _linspace_into(out, start, end)
+    _round_step_into(out, step, inv_step, precision)
+
+
+@njit(cache=True)
+def compute_quotes(
+    mid: float,
+    spread_bps: float,
+    vol: float,
+    bid_skew: float,
+    ask_skew: float,
+    num_orders: int,
+    size_base: np.ndarray,
+    tick: Tuple[float, float, int],
+    lot: Tuple[float, float, int],
+    bid_out: np.ndarray,
+    ask_out: np.ndarray,
+    size_out: np.ndarray,
+):
+    """
+    Price and size ladders in one pass: writes the tick-rounded bid/ask prices and the
+    lot-rounded sizes (scaled from `size_base`) into the output buffers.
+
+    `tick` and `lot` are (step, 1/step, precision). Each side has `num_orders // 2`
+    levels but spans `num_orders / 2` half-ranges, so odd counts quote the same
+    prices as the original ladder. Returns how many bid and ask levels were written;
+    a side pushed to full skew gets 0.
+    """
+    n = size_base.shape[0]
+    base_range = ((spread_bps * mid) / 10000) + vol
+    half = base_range / 2
+    best_bid = mid - half
+    best_ask = mid + half
+    tick_step, tick_inv, tick_prec = tick
+
+    if bid_skew >= 1:
+        linspace_round(bid_out, best_bid, mid - half * num_orders / 2, tick_step, tick_inv, tick_prec)
+        n_bid, n_ask = n, 0
+    elif ask_skew >= 1:
+        linspace_round(ask_out, best_ask, mid + half * num_orders / 2, tick_step, tick_inv, tick_prec)
+        n_bid, n_ask = 0, n
+    else:
+        linspace_round(bid_out, best_bid, best_bid - half * (1 - bid_skew) * (1 + ask_skew) * num_orders / 2, tick_step, tick_inv, tick_prec)
+        linspace_round(ask_out, best_ask, best_ask + half * (1 - ask_skew) * (1 + bid_skew) * num_orders / 2, tick_step, tick_inv, tick_prec)
+        n_bid, n_ask = n, n
+
+    for i in range(n):
+        size_out[i] = size_base[i] / mid
+    _round_step_into(size_out, lot[0], lot[1], lot[2])
+
+    return n_bid, n_ask
+
+
+@njit(cache=True)
+def _vol_update(buf, head, count, total, total_sq, x_new):
+    """Push `x_new` into the ring buffer and return the new state plus rolling std"""
+    n = buf.shape[0]
+    if count < n:
+        x_old = 0.0
+        count += 1
+    else:
+        x_old = buf[head]
+
+    buf[head] = x_new
+    head = (head + 1) % n
+    total += x_new - x_old
+    total_sq += x_new**2 - x_old**2
+
+    mean = total / count
+    var = total_sq / count - mean**2
+    if var < 0 or not math.isfinite(var):
+        var = 0.0
+    return head, count, total, total_sq, math.sqrt(var)
+
+
+@njit(cache=True)
+def _vol_update_hot(buf, head, total, total_sq, x_new):
+    """`_vol_update` once the window is full: no warmup branch, divides by the window size"""
+    n = buf.shape[0]
+    x_old = buf[head]
+    buf[head] = x_new
+    head = (head + 1) % n
+    total += x_new - x_old
+    total_sq += x_new * x_new - x_old * x_old
+
+    mean = total / n
+    var = total_sq / n - mean * mean
+    # NaN compares False, so non-finite variance also reports 0
+    return head, total, total_sq, math.sqrt(var) if var > 0 else 0.0
+
+
+class VolatilityEstimator:
+    def __init__(self, window_size):
+        self.n = window_size
+        self.buffer = np.zeros(window_size, dtype=np.float64)
+        self.head = 0
+        self.sum = 0.0
+        self.sum_sq = 0.0
+        self.count = 0
+
+    def update(self, x_new):
+        self.head, self.count, self.sum, self.sum_sq, sigma = _vol_update(
+            self.buffer, self.head, self.count, self.sum, self.sum_sq, float(x_new)
+        )
+        if self.count == self.n:
+            # Window is full from here on, switch to the steady-state path for good
+            self.update = self._update_hot
+        return sigma
+
+    def _update_hot(self, x_new):
+        self.head, self.sum, self.sum_sq, sigma = _vol_update_hot(
+            self.buffer, self.head, self.sum, self.sum_sq, float(x_new)
+        )
+        return sigma
+
 
 class SimpleQuoter:
     
@@ -20,6 +161,23 @@ class SimpleQuoter:
         self.gross_exposure_dollars = config["mm"]["gross_exposure_dollars"]
         self.epsilon = config["mm"]["epsilon"]
         self.inventory_max_dollars = config["mm"]["inventory_max_dollars"]
+        self.size_ratio = 0.6
+        # Output buffers for generate_quote_v2; one ladder is num_orders//2 per side
+        levels = self.num_orders // 2
+        self._out: List[Order] = [None] * (2 * levels)
+        self._bid_px_buf = np.empty(levels, dtype=np.float64)
+        self._ask_px_buf = np.empty(levels, dtype=np.float64)
+        self._size_buf = np.empty(levels, dtype=np.float64)
+        # Only the mid divisor changes between requotes
+        self._size_base = (self.gross_exposure_dollars * geometric_weights(self.num_orders/2, self.size_ratio))[::-1].copy()
+
+        # Steps are fixed per symbol, so rounding only needs a multiply and floor per value
+        self._tick_inv = 1.0 / self.tick_size
+        self._lot_inv = 1.0 / self.lot_size
+        self._tick_precision = step_precision(self.tick_size)
+        self._lot_precision = step_precision(self.lot_size)
+        self._tick = (float(self.tick_size), self._tick_inv, self._tick_precision)
+        self._lot = (float(self.lot_size), self._lot_inv, self._lot_precision)
 
         self.last_mid = 0
         self.prev_bid_skew = 0 
@@ -27,140 +185,82 @@ class SimpleQuoter:
         self.prev_vol = 0
         
         self.volatility_estimator = VolatilityEstimator(window_size=30)
+        self._warmup_kernels()
 
-    def _skew(self, position_value: float, max_skew_pct: float = 0.01) -> Tuple[float, float]:
-        bid_skew, ask_skew = 0, 0
-        inventory_delta = (position_value/self.inventory_max_dollars)
-
-        bid_skew += inventory_delta if inventory_delta < 0 else 0
-        ask_skew -= inventory_delta if inventory_delta > 0 else 0
+    def _warmup_kernels(self) -> None:
+        """
+        Compile (or load from cache) the quote and volatility kernels with the argument
+        types of a live requote, so the first one doesn't stall on JIT compilation
+        """
+        compute_quotes(
+            1.0, self.spread_bps, 0.0, 0.0, 0.0, self.num_orders, self._size_base,
+            self._tick, self._lot, self._bid_px_buf, self._ask_px_buf, self._size_buf,
+        )
+        scratch = np.zeros(2, dtype=np.float64)
+        _vol_update(scratch, 0, 0, 0.0, 0.0, 1.0)
+        _vol_update_hot(scratch, 0, 0.0, 0.0, 1.0)
 
-        bid_skew = bid_skew if position_value > -self.inventory_max_dollars else 1
-        ask_skew = ask_skew if position_value < self.inventory_max_dollars else 1
-
-        return nbabs(bid_skew), nbabs(ask_skew)
+    def _skew(self, position_value: float, max_skew_pct: float = 0.01) -> Tuple[float, float]:
+        # Skew the side that reduces inventory by the inventory fraction, fully (1) past the max
+        d = position_value / self.inventory_max_dollars
+        if d <= -1.0:
+            return 1.0, 0.0
+        if d >= 1.0:
+            return 0.0, 1.0
+        if d < 0:
+            return -d, 0.0
+        return 0.0, d
 
     def _volatility(self, mid: float) -> float:
         return self.volatility_estimator.update(mid)
 
-    def _prices(self,
-    mid: float,
-    best_bid: float,
-    best_ask: float,
-    bid_skew: float,
-    ask_skew: float,
-    vol: float):
-
-        base_range = ((self.spread_bps * mid)/10000) + vol
-
-        best_bid = mid - base_range/2
-        best_ask = mid + base_range/2
-
-        if bid_skew >= 1:
-            bid_lower = mid - (base_range/2 * self.num_orders/2)
-            bid_prices = nblinspace(best_bid, bid_lower, self.num_orders/2)
-            return bid_prices, None
-        
-        elif ask_skew >= 1:
-            ask_upper = mid + (base_range/2 * self.num_orders/2)
-            ask_prices = nblinspace(best_ask, ask_upper, self.num_orders/2)
-            return None, ask_prices
-
-        bid_lower = best_bid - (base_range/2 * (1-bid_skew) * (1+ask_skew) * self.num_orders/2)
-        ask_upper = best_ask + (base_range/2 * (1-ask_skew) * (1+bid_skew) * self.num_orders/2)
-
-        bid_prices = nblinspace(best_bid, bid_lower, self.num_orders/2)
-        ask_prices = nblinspace(best_ask, ask_upper, self.num_orders/2)
-
-        return bid_prices, ask_prices
-
-    def _sizes(self, mid: float):
-        sizes = (self.gross_exposure_dollars * geometric_weights(self.num_orders/2, 0.6) / mid)[::-1]
-        return sizes, sizes
-    
     def generate_quote_v2(self, lob: Dict[str, Any], position: float, forced_requote: bool) -> List[Order]:
+        """
+        Bids then asks for the current book and position, or [] when nothing moved enough.
+
+        A full ladder is returned in a list reused on every call, so callers must be
+        done with it (and its pooled orders) before the next requote.
+        """
         mid = lob["mid"]
         best_bid = lob["best_bid"]
         best_ask = lob["best_ask"]
 
-        bids, asks = [], []
+        quotes = []
 
         bid_skew, ask_skew = self._skew(position)
         vol = self._volatility(mid)
-        bid_prices, ask_prices = self._prices(mid, best_bid, best_ask, bid_skew, ask_skew, vol)
-        bid_sizes, ask_sizes = self._sizes(mid)
+        n_bid, n_ask = compute_quotes(
+            mid, self.spread_bps, vol, bid_skew, ask_skew, self.num_orders, self._size_base,
+            self._tick, self._lot, self._bid_px_buf, self._ask_px_buf, self._size_buf,
+        )
 
         condition1 = (self.last_mid - mid) > (self.epsilon * mid)/10000
-        condition2 = False#(self.prev_vol - vol) > (self.epsilon * vol)/10000
         condition3 = (self.prev_bid_skew - bid_skew) > (self.epsilon * bid_skew)/10000
         condition4 = (self.prev_ask_skew - ask_skew) > (self.epsilon * ask_skew)/10000
 
-        if condition1 or condition2 or condition3 or condition4 or forced_requote:
-
-            if isinstance(bid_prices, np.ndarray):
-                for bid_price, bid_size in zip(bid_prices, bid_sizes):
-                    bids.append(
-                        Order(
-                            symbol=self.symbol,
-                            side=Side.BUY,
-                            amount=round_step(bid_size, self.lot_size),
-                            price=round_step(bid_price, self.tick_size),    
-                            order_type=OrderType.LIMIT
-                        )
-                    )
-            if isinstance(ask_prices, np.ndarray):
-                for ask_price, ask_size in zip(ask_prices, ask_sizes):
-                    asks.append(
-                        Order(
-                            symbol=self.symbol,
-                            side=Side.SELL,
-                            amount=round_step(ask_size, self.lot_size),
-                            price=round_step(ask_price, self.tick_size),
-                            order_type=OrderType.LIMIT  
-                        )
-                    )
+        if condition1 or condition3 or condition4 or forced_requote:
+
+            if n_bid or n_ask:
+                # Unbox the rounded ladders to Python floats once before building orders
+                sizes = self._size_buf.tolist()
+                bid_prices = self._bid_px_buf.tolist() if n_bid else ()
+                ask_prices = self._ask_px_buf.tolist() if n_ask else ()
+
+                symbol = self.symbol
+                acquire = Order.acquire
+                out = self._out
+                filled = 0
+                for price, size in zip(bid_prices, sizes):
+                    out[filled] = acquire(symbol, Side.BUY, size, price, OrderType.LIMIT)
+                    filled += 1
+                for price, size in zip(ask_prices, sizes):
+                    out[filled] = acquire(symbol, Side.SELL, size, price, OrderType.LIMIT)
+                    filled += 1
+                quotes = out if filled == len(out) else out[:filled]
 
         self.prev_vol = vol
         self.prev_bid_skew = bid_skew
         self.prev_ask_skew = ask_skew
         self.last_mid = mid
 
-        return bids + asks
-
-    def generate_quote(self, update: Dict[str, Any], position_value: float) -> List[Order]:
-        mid = update["mid"]
-        best_bid = update["best_bid"]["price"]
-        best_ask = update["best_ask"]["price"]
-
-        quotes = []
-
-        if (self.last_mid - mid) > (self.epsilon * mid)/10000:
-            bid_skew, ask_skew = self._skew(position_value)
-            vol = self._volatility(mid)
-            bid_prices, ask_prices = self._prices(mid, best_bid, best_ask, bid_skew, ask_skew, vol)
-            bid_sizes, ask_sizes = self._sizes(mid)
-            #print(f"vol: {vol}, bid_skew: {bid_skew * mid}, ask_skew: {ask_skew * mid}")
-
-            for bid_price, bid_size, ask_price, ask_size in zip(bid_prices, bid_sizes, ask_prices, ask_sizes):
-                quotes.append(
-                    Order(
-                        symbol=self.symbol,
-                        side=Side.BUY,
-                        amount=round_step(bid_size, self.lot_size),
-                        price=round_step(bid_price, self.tick_size),    
-                        order_type=OrderType.LIMIT
-                    )
-                )
-                quotes.append(
-                    Order(
-                        symbol=self.symbol,
-                        side=Side.SELL,
-                        amount=round_step(ask_size, self.lot_size),
-                        price=round_step(ask_price, self.tick_size),
-                        order_type=OrderType.LIMIT  
-                    )
-                )
-
-        self.last_mid = mid
-
-        return quotes
\ No newline at end of file
+        return quotes
@@ -1,7 +1,8 @@
 import numpy as np 
 from typing import Optional
+from numba import njit, float64
 
-#@njit(float64(float64, float64, float64), cache=True)
+@njit(float64(float64, float64, float64), cache=True)
 def nbclip(val: float, min: float, max: float) -> float:
     if val < min:
         return min
@@ -10,7 +11,7 @@ def nbclip(val: float, min: float, max: float) -> float:
     else:
         return val
     
-#@njit(float64(float64), cache=True)
+@njit(float64(float64), cache=True)
 def nbabs(val: float) -> float:
     return np.abs(val)
 
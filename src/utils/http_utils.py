@@ -0,0 +1,46 @@
+import aiohttp
+from typing import Dict, Optional
+
+_CONNECTORS: Dict[Optional[str], aiohttp.TCPConnector] = {}
+# Sessions currently holding each host's connector, see `release_connector`
+_CONNECTOR_USERS: Dict[Optional[str], int] = {}
+
+def shared_connector(
+    host: Optional[str] = None,
+    limit: int = 64,
+    keepalive_timeout: float = 75,
+    ttl_dns_cache: int = 300,
+) -> aiohttp.TCPConnector:
+    """
+    Returns the process-wide keep-alive connector for a host, creating it on first use.
+
+    Sessions built on it must pass `connector_owner=False` so closing one session
+    does not tear down sockets still used by the others. Every call counts as one
+    user and must be paired with a `release_connector` once the session is closed.
+    """
+    connector = _CONNECTORS.get(host)
+    if connector is None or connector.closed:
+        connector = aiohttp.TCPConnector(
+            limit=limit,
+            keepalive_timeout=keepalive_timeout,
+            ttl_dns_cache=ttl_dns_cache,
+            enable_cleanup_closed=True,
+        )
+        _CONNECTORS[host] = connector
+        _CONNECTOR_USERS[host] = 0
+    _CONNECTOR_USERS[host] += 1
+    return connector
+
+async def release_connector(host: Optional[str] = None) -> None:
+    """
+    Drops one user of the shared connector for a host, closing and forgetting it
+    once the last user has released it.
+    """
+    users = _CONNECTOR_USERS.get(host, 0) - 1
+    if users > 0:
+        _CONNECTOR_USERS[host] = users
+        return
+    _CONNECTOR_USERS.pop(host, None)
+    connector = _CONNECTORS.pop(host, None)
+    if connector is not None:
+        await connector.close()
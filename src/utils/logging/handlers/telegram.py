@@ -2,9 +2,11 @@
 import asyncio
 import aiohttp
 import msgspec
-from typing import List, Coroutine
+from typing import List, Set
 from dataclasses import dataclass
 
+from src.utils.http_utils import shared_connector, release_connector
+
 
 @dataclass
 class TelegramLogConfig:
@@ -23,37 +25,86 @@ class TelegramLogConfig:
 
 class TelegramLogHandler:
     json_encoder = msgspec.json.Encoder()
+    max_message_length = 4096
+    max_in_flight = 4
+    max_queued = 64
+    host = "api.telegram.org"
 
     def __init__(self, config: TelegramLogConfig) -> None:
         self.chat_id = config.chat_id
 
-        self.url = f"https://api.telegram.org/bot{config.bot_token}/sendMessage"
+        self.url = f"https://{self.host}/bot{config.bot_token}/sendMessage"
         self.headers = {"Content-Type": "application/json"}
 
-        self.client = aiohttp.ClientSession()
+        # Long keep-alive so bursts of log flushes reuse one TLS session
+        self.client = aiohttp.ClientSession(
+            connector=shared_connector(self.host, limit=8, keepalive_timeout=300, ttl_dns_cache=3600),
+            connector_owner=False,
+        )
+
+        # Sends run in the background, at most `max_in_flight` at a time. Past
+        # `max_queued` pending sends (e.g. during a Telegram outage) messages are
+        # dropped, and the next one sent says how many
+        self._sem = asyncio.Semaphore(self.max_in_flight)
+        self._bg: Set[asyncio.Task] = set()
+        self._dropped = 0
 
     async def flush(self, buffer) -> None:
+        """
+        Schedule the buffered logs for sending and return without waiting on Telegram.
+        """
         try:
-            tasks: List[Coroutine] = []
-            for log in buffer:
+            for text in self._pack(buffer):
+                if len(self._bg) >= self.max_queued:
+                    self._dropped += 1
+                    continue
+                if self._dropped:
+                    text = f"[{self._dropped} log messages dropped]\n{text}"[:self.max_message_length]
+                    self._dropped = 0
                 payload = {
                     "chat_id": self.chat_id,
-                    "text": log,
+                    "text": text,
                     "disable_web_page_preview": True,
                 }
-                tasks.append(
-                    self.client.post(
-                        url=self.url,
-                        headers=self.headers,
-                        json=payload#self.json_encoder.encode(payload),
-                    )
-                )
-
-            ext = await asyncio.gather(*tasks)
-            return ext
+                task = asyncio.create_task(self._send_one(self.json_encoder.encode(payload)))
+                self._bg.add(task)
+                task.add_done_callback(self._bg.discard)
 
         except Exception as e:
             print(f"Failed to send message to Telegram: {e}")
 
+    async def _send_one(self, body: bytes) -> None:
+        async with self._sem:
+            try:
+                async with self.client.post(url=self.url, headers=self.headers, data=body) as response:
+                    await response.read()
+            except Exception as e:
+                print(f"Failed to send message to Telegram: {e}")
+
+    def _pack(self, buffer) -> List[str]:
+        """
+        Join buffered logs into as few messages as fit Telegram's text limit.
+        """
+        messages = []
+        current = []
+        size = 0
+        for log in buffer:
+            log = log[:self.max_message_length]
+            if current and size + 1 + len(log) > self.max_message_length:
+                messages.append("\n".join(current))
+                current = []
+                size = 0
+            size += len(log) + (1 if current else 0)
+            current.append(log)
+        if current:
+            messages.append("\n".join(current))
+        return messages
+
     async def close(self) -> None:
-        await self.client.close()
\ No newline at end of file
+        # Release the shared connector once only, a second release would drop another user
+        if self.client.closed:
+            return
+        if self._bg:
+            await asyncio.gather(*self._bg, return_exceptions=True)
+        await self.client.close()
+        await release_connector(self.host)
\ No newline at end of file
@@ -154,9 +154,18 @@ class Logger:
 
         return
 
-    def _submit_log(self, level: int, message: str) -> None:
+    def is_enabled_for(self, level: int) -> bool:
+        """
+        Whether a message at `level` would be recorded, for guarding costly log arguments.
+        """
+        return level >= self._base_level
+
+    def _submit_log(self, level: int, message: str, args: tuple = ()) -> None:
         try:
             if level >= self._base_level:
+                # %-style arguments are only formatted once the level check passes
+                if args:
+                    message = message % args
                 log_entry = f"{time_iso8601()} - {LOG_LEVEL_MAP[level]} - {message}"
                 self._ev_loop.call_soon_threadsafe(
                     self._queue.put_nowait, (log_entry, level)
@@ -165,14 +174,14 @@ class Logger:
         except Exception as e:
             raise Exception(f"Failed to submit log: {e}")
 
-    def debug(self, message: str) -> None:
-        self._submit_log(10, message)
+    def debug(self, message: str, *args) -> None:
+        self._submit_log(10, message, args)
 
-    def info(self, message: str) -> None:
-        self._submit_log(20, message)
+    def info(self, message: str, *args) -> None:
+        self._submit_log(20, message, args)
 
-    def warning(self, message: str) -> None:
-        self._submit_log(30, message)
+    def warning(self, message: str, *args) -> None:
+        self._submit_log(30, message, args)
 
-    def error(self, message: str) -> None:
-        self._submit_log(40, message)
+    def error(self, message: str, *args) -> None:
+        self._submit_log(40, message, args)
\ No newline at end of file
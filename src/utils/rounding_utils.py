@@ -1,4 +1,7 @@
 from decimal import Decimal
+from typing import Optional
+import math
+import numpy as np
 
 def round_step(num: float, step: float) -> float:
     """
@@ -7,3 +10,32 @@ def round_step(num: float, step: float) -> float:
     num = Decimal(str(num))
     return float(num - num % Decimal(str(step)))
 
+def step_precision(step: float) -> int:
+    """
+    Returns the number of decimal places in a step size
+    """
+    return max(0, -Decimal(str(step)).as_tuple().exponent)
+
+# Relative slack applied before flooring, so values already on the grid stay put. Float
+# error in num * inv_step is relative, a few ulps, so a fixed epsilon stops covering it
+# once the value is ~1e7 steps or more
+STEP_FLOOR_SLACK = 1.0 + 1e-15
+
+def round_step_fast(num: float, step: float, inv_step: float, precision: int) -> float:
+    """
+    Float-only `round_step` for a fixed step, given precomputed `1/step` and `step_precision(step)`
+    """
+    return round(math.floor(num * inv_step * STEP_FLOOR_SLACK) * step, precision)
+
+def round_step_array(
+    nums: np.ndarray,
+    step: float,
+    inv_step: Optional[float] = None,
+    precision: Optional[int] = None,
+) -> np.ndarray:
+    """
+    Rounds an array of floats to a given step size, matching `round_step`
+    """
+    inv_step = inv_step if inv_step is not None else 1.0 / step
+    precision = precision if precision is not None else step_precision(step)
+    return np.round(np.floor(nums * inv_step * STEP_FLOOR_SLACK) * step, precision)